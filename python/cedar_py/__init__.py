@@ -1,29 +1,129 @@
-"""Cedar-py: Python bindings for the Cedar policy language."""
+"""Cedar-py: Python bindings for the Cedar policy language.
+
+The names in ``__all__`` are stable, so hot loops can bind them to local
+names (e.g. ``authorize = cedar_py.is_authorized``) to skip the attribute
+lookup on each call.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Optional, Union
 
 from ._cedar_py import (
     CedarSchema,
     Decision,
     EntityStore,
+    EntityUid,
+    FrozenEntityStore,
+    FrozenPolicySet,
     PolicySet,
     PolicyTemplate,
     Request,
-    is_authorized,
+    is_authorized_many,
     validate_policies,
-    validate_policy,
     validate_template,
 )
+from ._cedar_py import is_authorized as _is_authorized
+from ._cedar_py import validate_policy as _validate_policy
 
 __version__ = "0.1.0"
 
-__all__ = [
+__all__ = (
     "CedarSchema",
     "Decision",
     "EntityStore",
+    "EntityUid",
+    "FrozenEntityStore",
+    "FrozenPolicySet",
     "PolicySet",
     "PolicyTemplate",
     "Request",
     "is_authorized",
+    "is_authorized_many",
     "validate_policy",
     "validate_template",
     "validate_policies",
-]
+)
+
+# Maximum number of decisions kept by is_authorized.
+_DECISION_CACHE_SIZE = 1024
+
+_decision_cache: "OrderedDict[tuple, Decision]" = OrderedDict()
+_decision_cache_lock = Lock()
+
+# Argument types accepted by is_authorized; others go straight to the native
+# function, which raises TypeError for them.
+_POLICY_TYPES = (PolicySet, FrozenPolicySet)
+_ENTITY_TYPES = (EntityStore, FrozenEntityStore)
+
+# Maximum number of policy texts whose validation result is kept.
+_VALIDATION_CACHE_SIZE = 256
+
+
+def is_authorized(
+    request: Request,
+    policies: Union[PolicySet, FrozenPolicySet],
+    entities: Optional[Union[EntityStore, FrozenEntityStore]] = None,
+) -> Decision:
+    """Make an authorization decision.
+
+    Decisions are cached on the request fingerprint and the version stamps of
+    the policy set and entity store. Modifying either of them changes its
+    stamp, so a cached decision is never returned for stale data.
+
+    Args:
+        request: The authorization request
+        policies: The policy set to evaluate against
+        entities: Optional entity store for hierarchical policies
+
+    Returns:
+        The authorization decision with diagnostics
+
+    Raises:
+        TypeError: If an argument has the wrong type
+    """
+    if not (
+        isinstance(request, Request)
+        and isinstance(policies, _POLICY_TYPES)
+        and (entities is None or isinstance(entities, _ENTITY_TYPES))
+    ):
+        return _is_authorized(request, policies, entities)
+
+    key = (
+        request._fingerprint,
+        policies._version,
+        None if entities is None else entities._version,
+    )
+    with _decision_cache_lock:
+        decision = _decision_cache.get(key)
+        if decision is not None:
+            _decision_cache.move_to_end(key)
+            return decision
+
+    decision = _is_authorized(request, policies, entities)
+
+    with _decision_cache_lock:
+        _decision_cache[key] = decision
+        if len(_decision_cache) > _DECISION_CACHE_SIZE:
+            _decision_cache.popitem(last=False)
+    return decision
+
+
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
+def validate_policy(policy_text: str) -> bool:
+    """Validate a Cedar policy text.
+
+    The Cedar grammar is fixed, so a text that parsed once always parses.
+    Valid texts are cached; invalid ones raise and are not cached.
+
+    Args:
+        policy_text: The Cedar policy text to validate
+
+    Returns:
+        True if the policy is valid
+
+    Raises:
+        ValueError: If the policy is invalid with error details
+    """
+    return _validate_policy(policy_text)
@@ -1,6 +1,6 @@
 """Type stubs for cedar_py._cedar_py module."""
 
-from typing import Optional
+from typing import Any, Mapping, Optional, Union
 
 class EntityStore:
     """A store for Cedar entities and their relationships."""
@@ -24,6 +24,21 @@ class EntityStore:
         """
         ...
 
+    def add_entities(
+        self,
+        entries: list[tuple[str, Optional[dict], Optional[list[str]]]],
+    ) -> None:
+        """Add many entities to the store in one call.
+
+        Args:
+            entries: List of (uid, attrs, parents) tuples; attrs and parents
+                may be None
+
+        Raises:
+            ValueError: If any entry is invalid; the store is then unchanged
+        """
+        ...
+
     def clear(self) -> None:
         """Remove all entities from the store."""
         ...
@@ -32,6 +47,51 @@ class EntityStore:
         """Get the number of entities."""
         ...
 
+    @property
+    def _version(self) -> int:
+        """Version stamp that changes whenever the store is modified."""
+        ...
+
+    def freeze(self) -> "FrozenEntityStore":
+        """Freeze the store into an immutable handle.
+
+        Returns:
+            An immutable snapshot of the current entities
+
+        Raises:
+            ValueError: If the entities cannot be combined into a collection
+        """
+        ...
+
+class FrozenEntityStore:
+    """An immutable snapshot of an EntityStore, created with freeze()."""
+
+    def __len__(self) -> int:
+        """Get the number of entities."""
+        ...
+
+    @property
+    def _version(self) -> int:
+        """Version stamp of the entities."""
+        ...
+
+class EntityUid:
+    """A parsed Cedar entity UID, reusable wherever a UID string is accepted as a slot value."""
+
+    def __init__(self, uid: str) -> None:
+        """Parse an entity UID.
+
+        Args:
+            uid: The entity UID (e.g., 'User::"alice"')
+
+        Raises:
+            ValueError: If the entity UID is invalid
+        """
+        ...
+
+    def __eq__(self, other: object) -> bool: ...
+    def __hash__(self) -> int: ...
+
 class Decision:
     """Authorization decision result."""
 
@@ -137,7 +197,10 @@ class PolicySet:
         ...
 
     def add_template_linked_policy(
-        self, policy_id: str, template_id: str, slots: dict[str, str]
+        self,
+        policy_id: str,
+        template_id: str,
+        slots: dict[str, Union[str, EntityUid]],
     ) -> None:
         """Add a template-linked policy to the set.
 
@@ -146,13 +209,58 @@ class PolicySet:
         Args:
             policy_id: Unique identifier for the policy
             template_id: ID of the template to use
-            slots: Dictionary mapping slot names to entity UIDs
+            slots: Dictionary mapping slot names to entity UIDs, given as
+                strings or as parsed EntityUid objects
 
         Raises:
             ValueError: If the template doesn't exist or slot values are invalid
         """
         ...
 
+    def add_template_linked_policies(
+        self, links: list[tuple[str, str, dict[str, Union[str, EntityUid]]]]
+    ) -> None:
+        """Add many template-linked policies to the set in one call.
+
+        Args:
+            links: List of (policy_id, template_id, slots) tuples
+
+        Raises:
+            ValueError: If any link is invalid; the set is then unchanged
+        """
+        ...
+
+    def link(
+        self, policy_id: str, template_id: str, *uids: Union[str, EntityUid]
+    ) -> None:
+        """Add a template-linked policy, with the slot values given positionally.
+
+        Args:
+            policy_id: Unique identifier for the policy
+            template_id: ID of the template to use
+            *uids: Entity UIDs for the template's slots, in the order
+                principal, resource
+
+        Raises:
+            ValueError: If the template doesn't exist, the number of values
+                doesn't match the template's slots, or a value is invalid
+        """
+        ...
+
+    def stats(self) -> tuple[int, int, int]:
+        """Get all counts of the set in a single call.
+
+        Returns:
+            The number of static policies, template-linked policies and
+            templates
+        """
+        ...
+
+    @property
+    def _version(self) -> int:
+        """Version stamp that changes whenever the set is modified."""
+        ...
+
     def __copy__(self) -> "PolicySet":
         """Support for copy.copy() - creates a shallow copy.
 
@@ -172,6 +280,29 @@ class PolicySet:
         """
         ...
 
+    def freeze(self) -> "FrozenPolicySet":
+        """Freeze the policy set into an immutable, pre-compiled handle.
+
+        Returns:
+            An immutable snapshot of the current policies
+
+        Raises:
+            ValueError: If the policies cannot be compiled
+        """
+        ...
+
+class FrozenPolicySet:
+    """An immutable, pre-compiled snapshot of a PolicySet, created with freeze()."""
+
+    def __len__(self) -> int:
+        """Get the number of policies (including template-linked policies)."""
+        ...
+
+    @property
+    def _version(self) -> int:
+        """Version stamp of the policies."""
+        ...
+
 class PolicyTemplate:
     """A Cedar policy template.
 
@@ -179,15 +310,39 @@ class PolicyTemplate:
     that can be filled in when instantiating the template.
     """
 
-    def __init__(self, template_id: str, template_text: str) -> None:
+    def __init__(
+        self, template_id: str, template_text: str, eager: bool = True
+    ) -> None:
         """Create a new policy template.
 
         Args:
             template_id: Unique identifier for the template
             template_text: The Cedar policy template text with slots (e.g., ?principal, ?resource)
+            eager: Parse the text now; with False it is parsed when the
+                template is first added to a PolicySet
+
+        Raises:
+            ValueError: If the template text is invalid and eager is True
+        """
+        ...
+
+    @classmethod
+    def from_bytes(
+        cls, template_id: str, template_text: bytes, eager: bool = True
+    ) -> "PolicyTemplate":
+        """Create a new policy template from UTF-8 encoded text.
+
+        Args:
+            template_id: Unique identifier for the template
+            template_text: The UTF-8 encoded Cedar policy template text
+            eager: Parse the text now, see the constructor
+
+        Returns:
+            The new template
 
         Raises:
-            ValueError: If the template text is invalid
+            ValueError: If the text is not valid UTF-8, or the template text
+                is invalid and eager is True
         """
         ...
 
@@ -226,8 +381,9 @@ class Request:
         principal: str,
         action: str,
         resource: str,
-        context: Optional[dict] = None,
+        context: Optional[Mapping[str, Any]] = None,
         schema: Optional[CedarSchema] = None,
+        context_json: Optional[bytes] = None,
     ) -> None:
         """Create a new authorization request.
 
@@ -235,11 +391,60 @@ class Request:
             principal: The principal entity (e.g., 'User::"alice"')
             action: The action entity (e.g., 'Action::"view"')
             resource: The resource entity (e.g., 'Document::"report"')
-            context: Optional context data as a dictionary
+            context: Optional context data as a dictionary or other mapping
             schema: Optional schema for request validation
+            context_json: Optional context as a UTF-8 encoded JSON object,
+                parsed directly in Rust; an alternative to context
+
+        Raises:
+            ValueError: If an entity UID or the context is invalid, or if
+                both context and context_json are given
+        """
+        ...
+
+    @staticmethod
+    def of(principal: str, action: str, resource: str) -> "Request":
+        """Create a request without context or schema from positional UIDs.
+
+        Faster than the constructor in loops that build many requests.
+
+        Args:
+            principal: The principal entity (e.g., 'User::"alice"')
+            action: The action entity (e.g., 'Action::"view"')
+            resource: The resource entity (e.g., 'Document::"report"')
+
+        Raises:
+            ValueError: If an entity UID is invalid
         """
         ...
 
+    @property
+    def principal(self) -> str:
+        """The principal entity UID."""
+        ...
+
+    @property
+    def action(self) -> str:
+        """The action entity UID."""
+        ...
+
+    @property
+    def resource(self) -> str:
+        """The resource entity UID."""
+        ...
+
+    @property
+    def _fingerprint(
+        self,
+    ) -> tuple[str, str, str, Optional[str], Optional[int]]:
+        """Hashable fingerprint used to cache authorization decisions."""
+        ...
+
+    def __hash__(self) -> int: ...
+    def __eq__(self, other: object) -> bool:
+        """Requests are equal when their entities, context and schema match."""
+        ...
+
 class CedarSchema:
     """A Cedar schema for policy validation."""
 
@@ -256,8 +461,8 @@ class CedarSchema:
 
 def is_authorized(
     request: Request,
-    policies: PolicySet,
-    entities: Optional[EntityStore] = None,
+    policies: Union[PolicySet, FrozenPolicySet],
+    entities: Optional[Union[EntityStore, FrozenEntityStore]] = None,
 ) -> Decision:
     """Make an authorization decision.
 
@@ -271,6 +476,23 @@ def is_authorized(
     """
     ...
 
+def is_authorized_many(
+    requests: list[Request],
+    policies: Union[PolicySet, FrozenPolicySet],
+    entities: Optional[Union[EntityStore, FrozenEntityStore]] = None,
+) -> list[Decision]:
+    """Make authorization decisions for many requests at once.
+
+    Args:
+        requests: The authorization requests
+        policies: The policy set to evaluate
+        entities: Optional entity store for hierarchical authorization
+
+    Returns:
+        One decision per request, in the same order
+    """
+    ...
+
 def validate_policy(policy_text: str) -> bool:
     """Validate a Cedar policy.
 
@@ -1,37 +1,99 @@
 use cedar_policy::{Context, RestrictedExpression};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::{PyBool, PyDict, PyFloat, PyInt, PyList, PyString};
-use serde_json::{json, Value as JsonValue};
+use pyo3::types::{PyBool, PyDict, PyFloat, PyInt, PyList, PyMapping, PyString};
+use std::fmt::Write;
 
-/// Convert a Python object to a serde_json Value
-pub fn py_to_json(obj: &Bound<'_, PyAny>) -> PyResult<JsonValue> {
-    if obj.is_none() {
-        Ok(JsonValue::Null)
-    } else if let Ok(b) = obj.downcast::<PyBool>() {
-        Ok(json!(b.is_true()))
+/// Convert a Python dict, or any other mapping, to a Cedar Context in a single walk.
+///
+/// Also returns a canonical key for the context: two mappings have equal keys
+/// exactly when they hold equal values, regardless of insertion order.
+pub fn py_mapping_to_context(obj: &Bound<'_, PyAny>) -> PyResult<(Context, String)> {
+    let mut key = String::new();
+    let pairs = match obj.downcast::<PyDict>() {
+        Ok(dict) => py_dict_to_pairs(dict, Some(&mut key))?,
+        Err(_) => py_dict_to_pairs(
+            &py_mapping_to_dict(obj.downcast::<PyMapping>()?)?,
+            Some(&mut key),
+        )?,
+    };
+
+    let context = Context::from_pairs(pairs)
+        .map_err(|e| PyValueError::new_err(format!("Failed to create context: {}", e)))?;
+    Ok((context, key))
+}
+
+/// Parse a UTF-8 JSON object to a Cedar Context.
+///
+/// Also returns a key for the context: the JSON text itself, tagged so it
+/// cannot be confused with a key produced by `py_mapping_to_context`.
+pub fn json_to_context(json: &[u8]) -> PyResult<(Context, String)> {
+    let text = std::str::from_utf8(json)
+        .map_err(|e| PyValueError::new_err(format!("Context JSON is not valid UTF-8: {}", e)))?;
+    let context = Context::from_json_str(text, None)
+        .map_err(|e| PyValueError::new_err(format!("Failed to create context: {}", e)))?;
+    Ok((context, format!("json:{}", text)))
+}
+
+/// Convert a Python value to a RestrictedExpression.
+///
+/// Walks the object directly, without an intermediate JSON value. If `key`
+/// is given, a canonical encoding of the value is appended to it.
+pub fn py_to_restricted_expr(
+    obj: &Bound<'_, PyAny>,
+    mut key: Option<&mut String>,
+) -> PyResult<RestrictedExpression> {
+    // PyBool must be checked before PyInt, since bool is a subclass of int
+    if let Ok(b) = obj.downcast::<PyBool>() {
+        let val = b.is_true();
+        if let Some(key) = key {
+            key.push_str(if val { "true" } else { "false" });
+        }
+        Ok(RestrictedExpression::new_bool(val))
     } else if let Ok(i) = obj.downcast::<PyInt>() {
         let val: i64 = i.extract()?;
-        Ok(json!(val))
-    } else if let Ok(f) = obj.downcast::<PyFloat>() {
-        let val: f64 = f.extract()?;
-        Ok(json!(val))
+        if let Some(key) = key {
+            let _ = write!(key, "{}", val);
+        }
+        Ok(RestrictedExpression::new_long(val))
     } else if let Ok(s) = obj.downcast::<PyString>() {
-        let val: String = s.extract()?;
-        Ok(json!(val))
+        let val = s.to_str()?;
+        if let Some(key) = key {
+            write_key_str(key, val);
+        }
+        Ok(RestrictedExpression::new_string(val.to_owned()))
     } else if let Ok(list) = obj.downcast::<PyList>() {
-        let mut vec = Vec::new();
+        let mut exprs = Vec::with_capacity(list.len());
+        if let Some(key) = key.as_deref_mut() {
+            key.push('[');
+        }
         for item in list.iter() {
-            vec.push(py_to_json(&item)?);
+            exprs.push(py_to_restricted_expr(&item, key.as_deref_mut())?);
+            if let Some(key) = key.as_deref_mut() {
+                key.push(',');
+            }
         }
-        Ok(JsonValue::Array(vec))
-    } else if let Ok(dict) = obj.downcast::<PyDict>() {
-        let mut map = serde_json::Map::new();
-        for (key, value) in dict.iter() {
-            let key_str: String = key.extract()?;
-            map.insert(key_str, py_to_json(&value)?);
+        if let Some(key) = key {
+            key.push(']');
         }
-        Ok(JsonValue::Object(map))
+        Ok(RestrictedExpression::new_set(exprs))
+    } else if let Ok(dict) = obj.downcast::<PyDict>() {
+        let pairs = py_dict_to_pairs(dict, key)?;
+        RestrictedExpression::new_record(pairs)
+            .map_err(|e| PyValueError::new_err(format!("Invalid record: {}", e)))
+    } else if let Ok(mapping) = obj.downcast::<PyMapping>() {
+        let pairs = py_dict_to_pairs(&py_mapping_to_dict(mapping)?, key)?;
+        RestrictedExpression::new_record(pairs)
+            .map_err(|e| PyValueError::new_err(format!("Invalid record: {}", e)))
+    } else if obj.is_none() {
+        Err(PyValueError::new_err(
+            "null values are not supported in context",
+        ))
+    } else if let Ok(f) = obj.downcast::<PyFloat>() {
+        Err(PyValueError::new_err(format!(
+            "Number {} is not a valid integer",
+            f.value()
+        )))
     } else {
         Err(PyValueError::new_err(format!(
             "Unsupported type for context: {}",
@@ -40,61 +102,54 @@ pub fn py_to_json(obj: &Bound<'_, PyAny>) -> PyResult<JsonValue> {
     }
 }
 
-/// Convert a Python dict to a Cedar Context
-pub fn py_dict_to_context(dict: &Bound<'_, PyDict>) -> PyResult<Context> {
-    // Convert Python dict to JSON
-    let json_value = py_to_json(dict.as_any())?;
+/// Copy a mapping that is not a dict, such as types.MappingProxyType, into a dict.
+fn py_mapping_to_dict<'py>(mapping: &Bound<'py, PyMapping>) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new_bound(mapping.py());
+    dict.update(mapping)?;
+    Ok(dict)
+}
 
-    // Convert JSON object to a map of restricted expressions
-    if let JsonValue::Object(map) = json_value {
-        let mut pairs = Vec::new();
+/// Convert the entries of a Python dict to named RestrictedExpressions.
+///
+/// If `key` is given, the entries are encoded into it sorted by name, so the
+/// encoding does not depend on the dict's insertion order.
+fn py_dict_to_pairs(
+    dict: &Bound<'_, PyDict>,
+    key: Option<&mut String>,
+) -> PyResult<Vec<(String, RestrictedExpression)>> {
+    let Some(key) = key else {
+        return dict
+            .iter()
+            .map(|(k, v)| Ok((k.extract()?, py_to_restricted_expr(&v, None)?)))
+            .collect();
+    };
 
-        for (key, value) in map {
-            // Convert each JSON value to a RestrictedExpression
-            let expr = json_value_to_restricted_expr(&value)?;
-            pairs.push((key, expr));
-        }
+    let mut entries = Vec::with_capacity(dict.len());
+    for (k, v) in dict.iter() {
+        let name: String = k.extract()?;
+        let mut value_key = String::new();
+        let expr = py_to_restricted_expr(&v, Some(&mut value_key))?;
+        entries.push((name, expr, value_key));
+    }
+    entries.sort_unstable_by(|a, b| a.0.cmp(&b.0));
 
-        // Create context from pairs
-        Context::from_pairs(pairs)
-            .map_err(|e| PyValueError::new_err(format!("Failed to create context: {}", e)))
-    } else {
-        Err(PyValueError::new_err("Context must be a dictionary"))
+    key.push('{');
+    for (name, _, value_key) in &entries {
+        write_key_str(key, name);
+        key.push(':');
+        key.push_str(value_key);
+        key.push(',');
     }
+    key.push('}');
+
+    Ok(entries
+        .into_iter()
+        .map(|(name, expr, _)| (name, expr))
+        .collect())
 }
 
-/// Convert a JSON value to a RestrictedExpression
-pub fn json_value_to_restricted_expr(value: &JsonValue) -> PyResult<RestrictedExpression> {
-    match value {
-        JsonValue::Null => Err(PyValueError::new_err(
-            "null values are not supported in context",
-        )),
-        JsonValue::Bool(b) => Ok(RestrictedExpression::new_bool(*b)),
-        JsonValue::Number(n) => {
-            if let Some(i) = n.as_i64() {
-                Ok(RestrictedExpression::new_long(i))
-            } else {
-                Err(PyValueError::new_err(format!(
-                    "Number {} is not a valid integer",
-                    n
-                )))
-            }
-        }
-        JsonValue::String(s) => Ok(RestrictedExpression::new_string(s.clone())),
-        JsonValue::Array(arr) => {
-            let mut exprs = Vec::new();
-            for item in arr {
-                exprs.push(json_value_to_restricted_expr(item)?);
-            }
-            Ok(RestrictedExpression::new_set(exprs))
-        }
-        JsonValue::Object(map) => {
-            let mut pairs = Vec::new();
-            for (k, v) in map {
-                pairs.push((k.clone(), json_value_to_restricted_expr(v)?));
-            }
-            Ok(RestrictedExpression::new_record(pairs)
-                .map_err(|e| PyValueError::new_err(format!("Invalid record: {}", e)))?)
-        }
-    }
+/// Append a string to a context key, quoted and escaped so it cannot be
+/// confused with the surrounding structure.
+fn write_key_str(key: &mut String, s: &str) {
+    let _ = write!(key, "{:?}", s);
 }
@@ -1,28 +1,35 @@
 use cedar_policy::{Decision as CedarDecision, Response as CedarResponse};
 use pyo3::prelude::*;
+use std::sync::OnceLock;
 
 /// Authorization decision result.
 ///
 /// This represents the result of an authorization decision, including
 /// the decision itself (Allow/Deny) and any diagnostic information.
-#[pyclass]
+/// Decisions are immutable, and may be shared through the decision cache.
+#[pyclass(frozen)]
 pub struct Decision {
-    decision: String,
-    diagnostics: Vec<String>,
+    allowed: bool,
+    response: CedarResponse,              // Kept to format diagnostics on demand
+    diagnostics: OnceLock<Vec<String>>, // Formatted on first access
 }
 
 #[pymethods]
 impl Decision {
     /// Get the decision as a string ('Allow' or 'Deny').
     #[getter]
-    fn decision(&self) -> String {
-        self.decision.clone()
+    fn decision(&self) -> &'static str {
+        if self.allowed {
+            "Allow"
+        } else {
+            "Deny"
+        }
     }
 
     /// Get the list of diagnostic messages.
     #[getter]
     fn diagnostics(&self) -> Vec<String> {
-        self.diagnostics.clone()
+        self.get_diagnostics().clone()
     }
 
     /// Check if the decision is 'Allow'.
@@ -30,47 +37,57 @@ impl Decision {
     /// Returns:
     ///     bool: True if the decision is 'Allow', False otherwise
     fn is_allowed(&self) -> bool {
-        self.decision == "Allow"
+        self.allowed
     }
 
     /// String representation of the decision.
     fn __repr__(&self) -> String {
         format!(
             "Decision(decision='{}', diagnostics={:?})",
-            self.decision, self.diagnostics
+            self.decision(),
+            self.get_diagnostics()
         )
     }
 
     /// Boolean conversion - True if allowed.
     fn __bool__(&self) -> bool {
-        self.is_allowed()
+        self.allowed
     }
 }
 
 impl Decision {
     /// Create a Decision from a Cedar Response (internal use).
+    ///
+    /// Diagnostic messages are not formatted until they are first read.
     pub(crate) fn from_cedar_response(response: CedarResponse) -> Self {
-        let decision = match response.decision() {
-            CedarDecision::Allow => "Allow",
-            CedarDecision::Deny => "Deny",
+        let allowed = match response.decision() {
+            CedarDecision::Allow => true,
+            CedarDecision::Deny => false,
+        };
+
+        Decision {
+            allowed,
+            response,
+            diagnostics: OnceLock::new(),
         }
-        .to_string();
+    }
 
-        let mut diagnostics = Vec::new();
+    /// Get the diagnostic messages, formatting them on first use.
+    fn get_diagnostics(&self) -> &Vec<String> {
+        self.diagnostics.get_or_init(|| {
+            let mut diagnostics = Vec::new();
 
-        // Add information about errors if any
-        for error in response.diagnostics().errors() {
-            diagnostics.push(format!("Error: {}", error));
-        }
+            // Add information about errors if any
+            for error in self.response.diagnostics().errors() {
+                diagnostics.push(format!("Error: {}", error));
+            }
 
-        // Add information about reasons (policies that contributed to the decision)
-        for reason in response.diagnostics().reason() {
-            diagnostics.push(format!("Reason: {}", reason));
-        }
+            // Add information about reasons (policies that contributed to the decision)
+            for reason in self.response.diagnostics().reason() {
+                diagnostics.push(format!("Reason: {}", reason));
+            }
 
-        Decision {
-            decision,
-            diagnostics,
-        }
+            diagnostics
+        })
     }
 }
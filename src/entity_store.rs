@@ -1,10 +1,12 @@
 use cedar_policy::{Entities, Entity, EntityUid};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList};
-use std::collections::HashMap;
+use pyo3::types::{PyDict, PyList, PyString};
+use rustc_hash::FxHashMap;
+use std::collections::{HashMap, HashSet};
 use std::str::FromStr;
-use crate::context_utils::py_to_json;
+use std::sync::{Arc, OnceLock};
+use crate::context_utils::py_to_restricted_expr;
 
 /// An entity store for Cedar authorization.
 ///
@@ -12,7 +14,10 @@ use crate::context_utils::py_to_json;
 /// during authorization to evaluate hierarchical policies.
 #[pyclass]
 pub struct EntityStore {
-    entities: HashMap<String, Entity>,
+    ids: FxHashMap<EntityUid, u32>, // Interned entity UID -> index into `entities`
+    entities: Vec<Entity>,
+    version: u64,
+    compiled: OnceLock<Arc<Entities>>, // Cedar entity collection, built on first use
 }
 
 #[pymethods]
@@ -21,7 +26,10 @@ impl EntityStore {
     #[new]
     fn new() -> Self {
         EntityStore {
-            entities: HashMap::new(),
+            ids: FxHashMap::default(),
+            entities: Vec::new(),
+            version: crate::next_version(),
+            compiled: OnceLock::new(),
         }
     }
 
@@ -42,44 +50,52 @@ impl EntityStore {
     #[pyo3(signature = (uid, attrs=None, parents=None))]
     fn add_entity(
         &mut self,
-        uid: String,
+        uid: &str,
         attrs: Option<Bound<'_, PyDict>>,
         parents: Option<Bound<'_, PyList>>,
     ) -> PyResult<()> {
-        // Parse the entity UID
-        let entity_uid = EntityUid::from_str(&uid)
-            .map_err(|e| PyValueError::new_err(format!("Invalid entity UID '{}': {}", uid, e)))?;
-
-        // Parse parent UIDs
-        let mut parent_uids = vec![];
-        if let Some(parents_list) = parents {
-            for parent in parents_list.iter() {
-                let parent_str: String = parent.extract()?;
-                let parent_uid = EntityUid::from_str(&parent_str)
-                    .map_err(|e| PyValueError::new_err(format!("Invalid parent UID '{}': {}", parent_str, e)))?;
-                parent_uids.push(parent_uid);
-            }
-        }
-
-        // Convert attributes to HashMap<String, RestrictedExpression>
-        let mut attr_map = HashMap::new();
-        if let Some(attrs_dict) = attrs {
-            for (key, value) in attrs_dict.iter() {
-                let key_str: String = key.extract()?;
-                let json_val = py_to_json(&value)?;
-                let expr = super::context_utils::json_value_to_restricted_expr(&json_val)?;
-                attr_map.insert(key_str, expr);
-            }
-        }
+        let entity = build_entity(uid, attrs, parents)?;
+        self.insert_entity(entity);
+        self.mark_modified();
+        Ok(())
+    }
 
-        // Create the entity using builder pattern
-        let entity = Entity::new(
-            entity_uid.clone(),
-            attr_map,
-            parent_uids.into_iter().collect(),
-        ).map_err(|e| PyValueError::new_err(format!("Failed to create entity: {}", e)))?;
+    /// Add many entities to the store in one call.
+    ///
+    /// All entries are converted before any is added, so if one is invalid
+    /// the store is left unchanged.
+    ///
+    /// Args:
+    ///     entries (list): List of (uid, attrs, parents) tuples, where attrs
+    ///         and parents may be None
+    ///
+    /// Raises:
+    ///     ValueError: If any entity UID, attribute or parent is invalid
+    ///
+    /// Example:
+    ///     >>> store = EntityStore()
+    ///     >>> store.add_entities([
+    ///     ...     ('Group::"admins"', None, None),
+    ///     ...     ('User::"alice"', {"role": "admin"}, ['Group::"admins"']),
+    ///     ... ])
+    fn add_entities(
+        &mut self,
+        entries: Vec<(
+            Bound<'_, PyString>,
+            Option<Bound<'_, PyDict>>,
+            Option<Bound<'_, PyList>>,
+        )>,
+    ) -> PyResult<()> {
+        let entities = entries
+            .into_iter()
+            .map(|(uid, attrs, parents)| build_entity(uid.to_str()?, attrs, parents))
+            .collect::<PyResult<Vec<_>>>()?;
 
-        self.entities.insert(uid, entity);
+        self.entities.reserve(entities.len());
+        for entity in entities {
+            self.insert_entity(entity);
+        }
+        self.mark_modified();
         Ok(())
     }
 
@@ -93,17 +109,142 @@ impl EntityStore {
         format!("EntityStore(entities={})", self.entities.len())
     }
 
+    /// Freeze the store into an immutable handle.
+    ///
+    /// The Cedar entity collection, including the transitive closure of the
+    /// hierarchy, is built once, here. The returned handle can be passed to
+    /// is_authorized and is_authorized_many in place of the store, and is
+    /// not affected by later changes to this store.
+    ///
+    /// Returns:
+    ///     FrozenEntityStore: An immutable snapshot of the current entities
+    ///
+    /// Raises:
+    ///     ValueError: If the entities cannot be combined into a collection
+    fn freeze(&self) -> PyResult<FrozenEntityStore> {
+        Ok(FrozenEntityStore {
+            entities: self.to_cedar_entities()?,
+            len: self.entities.len(),
+            version: self.version,
+        })
+    }
+
     /// Clear all entities from the store.
     fn clear(&mut self) {
+        self.ids.clear();
         self.entities.clear();
+        self.mark_modified();
+    }
+
+    /// Version stamp of the store (internal use).
+    ///
+    /// The stamp changes whenever an entity is added or the store is cleared.
+    #[getter(_version)]
+    fn version(&self) -> u64 {
+        self.version
     }
 }
 
 impl EntityStore {
+    /// Add an entity, replacing an existing entity with the same UID.
+    fn insert_entity(&mut self, entity: Entity) {
+        match self.ids.get(&entity.uid()) {
+            Some(&id) => self.entities[id as usize] = entity,
+            None => {
+                self.ids.insert(entity.uid(), self.entities.len() as u32);
+                self.entities.push(entity);
+            }
+        }
+    }
+
+    /// Record a modification: bump the version and drop the compiled entities.
+    fn mark_modified(&mut self) {
+        self.version = crate::next_version();
+        self.compiled = OnceLock::new();
+    }
+
     /// Convert to Cedar Entities (internal use).
-    pub(crate) fn to_cedar_entities(&self) -> PyResult<Entities> {
-        let entities_vec: Vec<Entity> = self.entities.values().cloned().collect();
-        Entities::from_entities(entities_vec, None)
-            .map_err(|e| PyValueError::new_err(format!("Failed to create entity collection: {}", e)))
+    ///
+    /// The collection is built on first use and cached until the next
+    /// modification of the store.
+    pub(crate) fn to_cedar_entities(&self) -> PyResult<Arc<Entities>> {
+        if let Some(entities) = self.compiled.get() {
+            return Ok(entities.clone());
+        }
+
+        let entities = Entities::from_entities(self.entities.iter().cloned(), None)
+            .map_err(|e| PyValueError::new_err(format!("Failed to create entity collection: {}", e)))?;
+        Ok(self.compiled.get_or_init(|| Arc::new(entities)).clone())
+    }
+}
+
+/// An immutable snapshot of an EntityStore.
+///
+/// Created with `EntityStore.freeze()`. Being immutable, it can be shared
+/// freely between threads and needs no checks for modification.
+#[pyclass(frozen)]
+pub struct FrozenEntityStore {
+    entities: Arc<Entities>,
+    len: usize,
+    version: u64, // Stamp of the source store when frozen; the contents are identical
+}
+
+#[pymethods]
+impl FrozenEntityStore {
+    /// Get the number of entities.
+    fn __len__(&self) -> usize {
+        self.len
+    }
+
+    /// String representation of the frozen entity store.
+    fn __repr__(&self) -> String {
+        format!("FrozenEntityStore(entities={})", self.len)
     }
+
+    /// Version stamp of the entities (internal use).
+    #[getter(_version)]
+    fn version(&self) -> u64 {
+        self.version
+    }
+}
+
+impl FrozenEntityStore {
+    /// Get the Cedar entity collection (internal use).
+    pub(crate) fn to_cedar_entities(&self) -> Arc<Entities> {
+        self.entities.clone()
+    }
+}
+
+/// Build a Cedar entity from its Python UID, attributes and parents.
+fn build_entity(
+    uid: &str,
+    attrs: Option<Bound<'_, PyDict>>,
+    parents: Option<Bound<'_, PyList>>,
+) -> PyResult<Entity> {
+    // Parse the entity UID
+    let entity_uid = EntityUid::from_str(uid)
+        .map_err(|e| PyValueError::new_err(format!("Invalid entity UID '{}': {}", uid, e)))?;
+
+    // Parse parent UIDs straight into the set the entity keeps
+    let mut parent_uids = HashSet::with_capacity(parents.as_ref().map_or(0, |p| p.len()));
+    if let Some(parents_list) = parents {
+        for parent in parents_list.iter() {
+            let parent_str = parent.downcast::<PyString>()?.to_str()?;
+            let parent_uid = EntityUid::from_str(parent_str)
+                .map_err(|e| PyValueError::new_err(format!("Invalid parent UID '{}': {}", parent_str, e)))?;
+            parent_uids.insert(parent_uid);
+        }
+    }
+
+    // Convert attributes to HashMap<String, RestrictedExpression>
+    let mut attr_map = HashMap::with_capacity(attrs.as_ref().map_or(0, |a| a.len()));
+    if let Some(attrs_dict) = attrs {
+        for (key, value) in attrs_dict.iter() {
+            let key_str: String = key.extract()?;
+            attr_map.insert(key_str, py_to_restricted_expr(&value, None)?);
+        }
+    }
+
+    Entity::new(entity_uid, attr_map, parent_uids)
+        .map_err(|e| PyValueError::new_err(format!("Failed to create entity: {}", e)))
 }
@@ -0,0 +1,97 @@
+use cedar_policy::EntityUid as CedarEntityUid;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyString;
+use rustc_hash::FxHasher;
+use std::hash::{Hash, Hasher};
+use std::str::FromStr;
+
+/// A parsed Cedar entity UID.
+///
+/// Parsing a UID string once and passing the resulting object wherever the
+/// same entity is used (e.g. as a slot value of many template-linked
+/// policies) skips parsing the string again on each use.
+///
+/// Example:
+///     >>> alice = EntityUid('User::"alice"')
+///     >>> policy_set.add_template_linked_policy(
+///     ...     "alice-view-report",
+///     ...     "view-template",
+///     ...     {"principal": alice, "resource": 'Document::"report"'}
+///     ... )
+#[pyclass(name = "EntityUid", frozen)]
+pub struct EntityUid {
+    uid: CedarEntityUid,
+}
+
+#[pymethods]
+impl EntityUid {
+    /// Parse an entity UID.
+    ///
+    /// Args:
+    ///     uid (str): The entity UID (e.g., 'User::"alice"')
+    ///
+    /// Raises:
+    ///     ValueError: If the entity UID is invalid
+    #[new]
+    fn new(uid: &str) -> PyResult<Self> {
+        let uid = CedarEntityUid::from_str(uid)
+            .map_err(|e| PyValueError::new_err(format!("Invalid entity UID '{}': {}", uid, e)))?;
+        Ok(EntityUid { uid })
+    }
+
+    /// The entity UID as a string.
+    fn __str__(&self) -> String {
+        self.uid.to_string()
+    }
+
+    /// String representation of the entity UID.
+    fn __repr__(&self) -> String {
+        format!("EntityUid('{}')", self.uid)
+    }
+
+    /// Entity UIDs are equal when they name the same entity.
+    fn __eq__(&self, other: &Bound<'_, PyAny>) -> PyObject {
+        let py = other.py();
+        match other.downcast::<EntityUid>() {
+            Ok(other) => (self.uid == other.get().uid).into_py(py),
+            Err(_) => py.NotImplemented(),
+        }
+    }
+
+    /// Hash of the entity UID, consistent with equality.
+    fn __hash__(&self) -> u64 {
+        let mut hasher = FxHasher::default();
+        self.uid.hash(&mut hasher);
+        hasher.finish()
+    }
+}
+
+impl EntityUid {
+    /// Get the parsed Cedar entity UID (internal use).
+    pub(crate) fn get_uid(&self) -> &CedarEntityUid {
+        &self.uid
+    }
+}
+
+/// An entity UID given as a string or as a parsed EntityUid (internal use).
+#[derive(FromPyObject)]
+pub(crate) enum EntityUidInput<'py> {
+    Parsed(Bound<'py, EntityUid>),
+    Text(Bound<'py, PyString>),
+}
+
+impl EntityUidInput<'_> {
+    /// Get the Cedar entity UID, parsing it if it was given as a string.
+    pub(crate) fn to_cedar_uid(&self) -> PyResult<CedarEntityUid> {
+        match self {
+            EntityUidInput::Parsed(uid) => Ok(uid.get().get_uid().clone()),
+            EntityUidInput::Text(text) => {
+                let text = text.to_str()?;
+                CedarEntityUid::from_str(text).map_err(|e| {
+                    PyValueError::new_err(format!("Invalid entity UID '{}': {}", text, e))
+                })
+            }
+        }
+    }
+}
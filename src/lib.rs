@@ -1,23 +1,67 @@
-use cedar_policy::{Authorizer, Policy, Template};
+use cedar_policy::{Authorizer, Entities, Policy, Request as CedarRequest};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use rayon::prelude::*;
 use std::str::FromStr;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::{Arc, OnceLock};
 
 mod context_utils;
 mod decision;
 mod entity_store;
+mod entity_uid;
+mod parse_cache;
 mod policy_set;
 mod policy_template;
 mod request;
 mod schema;
 
 use decision::Decision;
-use entity_store::EntityStore;
-use policy_set::PolicySet;
-use policy_template::PolicyTemplate;
+use entity_store::{EntityStore, FrozenEntityStore};
+use entity_uid::EntityUid;
+use policy_set::{CompiledPolicySet, FrozenPolicySet, PolicySet};
+use policy_template::{parse_template_cached, PolicyTemplate};
 use request::Request;
 use schema::CedarSchema;
 
+/// Process-wide source of version stamps.
+static NEXT_VERSION: AtomicU64 = AtomicU64::new(1);
+
+/// Get a fresh version stamp (internal use).
+///
+/// Stamps are unique across all objects in the process, so two objects only
+/// share a stamp when one is an unmodified copy of the other.
+pub(crate) fn next_version() -> u64 {
+    NEXT_VERSION.fetch_add(1, Ordering::Relaxed)
+}
+
+/// Get the shared Cedar authorizer (internal use).
+pub(crate) fn authorizer() -> &'static Authorizer {
+    static AUTHORIZER: OnceLock<Authorizer> = OnceLock::new();
+    AUTHORIZER.get_or_init(Authorizer::new)
+}
+
+/// Smallest batch that is_authorized_many evaluates on the thread pool.
+const PARALLEL_BATCH_SIZE: usize = 16;
+
+/// Get the thread pool used for batch authorization (internal use).
+///
+/// The number of threads can be set with the `CEDAR_PY_THREADS` environment
+/// variable; by default one thread per CPU core is used.
+fn thread_pool() -> &'static rayon::ThreadPool {
+    static POOL: OnceLock<rayon::ThreadPool> = OnceLock::new();
+    POOL.get_or_init(|| {
+        let num_threads = std::env::var("CEDAR_PY_THREADS")
+            .ok()
+            .and_then(|value| value.parse().ok())
+            .unwrap_or(0);
+        rayon::ThreadPoolBuilder::new()
+            .num_threads(num_threads)
+            .build()
+            .expect("failed to build the authorization thread pool")
+    })
+}
+
 /// Validate a Cedar policy text.
 ///
 /// Args:
@@ -48,18 +92,18 @@ fn validate_policy(policy_text: &str) -> PyResult<bool> {
 ///     ValueError: If the template is invalid with error details
 #[pyfunction]
 fn validate_template(template_text: &str) -> PyResult<bool> {
-    match Template::from_str(template_text) {
-        Ok(_) => Ok(true),
-        Err(e) => Err(PyValueError::new_err(format!("Invalid template: {}", e))),
-    }
+    // Shares the parse cache of PolicyTemplate, so validating a text and
+    // then building a template from it parses only once
+    parse_template_cached(template_text)?;
+    Ok(true)
 }
 
 /// Make an authorization decision.
 ///
 /// Args:
 ///     request (Request): The authorization request
-///     policies (PolicySet): The policy set to evaluate against
-///     entities (EntityStore, optional): Optional entity store for hierarchical policies
+///     policies (PolicySet | FrozenPolicySet): The policy set to evaluate against
+///     entities (EntityStore | FrozenEntityStore, optional): Optional entity store for hierarchical policies
 ///
 /// Returns:
 ///     Decision: The authorization decision with diagnostics
@@ -71,44 +115,135 @@ fn validate_template(template_text: &str) -> PyResult<bool> {
 #[pyfunction]
 #[pyo3(signature = (request, policies, entities=None))]
 fn is_authorized(
+    py: Python<'_>,
     request: &Request,
-    policies: &PolicySet,
-    entities: Option<&EntityStore>,
+    policies: PoliciesInput<'_>,
+    entities: Option<EntitiesInput<'_>>,
 ) -> PyResult<Decision> {
-    // Create the authorizer
-    let authorizer = Authorizer::new();
-
-    // Convert our request to a Cedar request
+    // Get the Cedar request built at construction
     let cedar_request = request.to_cedar_request()?;
 
-    // Get the Cedar policy set
-    let policy_set = policies.get_cedar_policy_set();
+    let (compiled, cedar_entities) = authorization_inputs(policies, entities)?;
 
-    // Get entities or use empty set
-    let cedar_entities = if let Some(store) = entities {
-        store.to_cedar_entities()?
-    } else {
-        cedar_policy::Entities::empty()
+    // Make the authorization decision against the policies that can apply to
+    // the action and resource type, without holding the GIL
+    let response = py.allow_threads(|| {
+        let policy_set = compiled.for_request(cedar_request);
+        authorizer().is_authorized(cedar_request, &policy_set, &cedar_entities)
+    });
+
+    Ok(Decision::from_cedar_response(response))
+}
+
+/// Make authorization decisions for many requests at once.
+///
+/// The policy set and entity store are converted once for the whole batch,
+/// and the requests are evaluated with the GIL released; batches of 16 or
+/// more requests are evaluated in parallel. The number of worker threads
+/// can be set with the `CEDAR_PY_THREADS` environment variable.
+///
+/// Args:
+///     requests (list[Request]): The authorization requests
+///     policies (PolicySet | FrozenPolicySet): The policy set to evaluate against
+///     entities (EntityStore | FrozenEntityStore, optional): Optional entity store for hierarchical policies
+///
+/// Returns:
+///     list[Decision]: One decision per request, in the same order
+///
+/// Example:
+///     >>> decisions = is_authorized_many([request1, request2], policies, store)
+///     >>> allowed = [d.is_allowed() for d in decisions]
+#[pyfunction]
+#[pyo3(signature = (requests, policies, entities=None))]
+fn is_authorized_many(
+    py: Python<'_>,
+    requests: Vec<PyRef<'_, Request>>,
+    policies: PoliciesInput<'_>,
+    entities: Option<EntitiesInput<'_>>,
+) -> PyResult<Vec<Decision>> {
+    // Convert all requests up front so errors surface before any evaluation
+    let cedar_requests = requests
+        .iter()
+        .map(|request| request.to_cedar_request())
+        .collect::<PyResult<Vec<_>>>()?;
+
+    let (compiled, cedar_entities) = authorization_inputs(policies, entities)?;
+
+    let authorize = |cedar_request: &&CedarRequest| {
+        let policy_set = compiled.for_request(cedar_request);
+        authorizer().is_authorized(cedar_request, &policy_set, &cedar_entities)
     };
 
-    // Make the authorization decision
-    let response = authorizer.is_authorized(&cedar_request, &policy_set, &cedar_entities);
+    // Evaluate the whole batch without holding the GIL; small batches run on
+    // this thread, since handing them to the pool costs more than it saves
+    let responses: Vec<_> = py.allow_threads(|| {
+        if cedar_requests.len() < PARALLEL_BATCH_SIZE {
+            cedar_requests.iter().map(authorize).collect()
+        } else {
+            thread_pool().install(|| cedar_requests.par_iter().map(authorize).collect())
+        }
+    });
 
-    Ok(Decision::from_cedar_response(response))
+    Ok(responses
+        .into_iter()
+        .map(Decision::from_cedar_response)
+        .collect())
+}
+
+/// A PolicySet or a FrozenPolicySet, as accepted by the authorization functions.
+#[derive(FromPyObject)]
+enum PoliciesInput<'py> {
+    Set(Bound<'py, PolicySet>),
+    Frozen(Bound<'py, FrozenPolicySet>),
+}
+
+/// An EntityStore or a FrozenEntityStore, as accepted by the authorization functions.
+#[derive(FromPyObject)]
+enum EntitiesInput<'py> {
+    Store(Bound<'py, EntityStore>),
+    Frozen(Bound<'py, FrozenEntityStore>),
+}
+
+/// Get the compiled policies and entities to authorize against (internal use).
+///
+/// The policy set and entity store are only borrowed while their compiled
+/// forms are fetched, so other threads can modify them while a decision is
+/// evaluated without the GIL.
+fn authorization_inputs(
+    policies: PoliciesInput<'_>,
+    entities: Option<EntitiesInput<'_>>,
+) -> PyResult<(Arc<CompiledPolicySet>, Arc<Entities>)> {
+    let compiled = match policies {
+        PoliciesInput::Set(set) => set.borrow().get_compiled()?,
+        PoliciesInput::Frozen(frozen) => frozen.get().get_compiled(),
+    };
+
+    // Get entities or use empty set
+    let cedar_entities = match entities {
+        Some(EntitiesInput::Store(store)) => store.borrow().to_cedar_entities()?,
+        Some(EntitiesInput::Frozen(frozen)) => frozen.get().to_cedar_entities(),
+        None => Arc::new(Entities::empty()),
+    };
+
+    Ok((compiled, cedar_entities))
 }
 
 /// Python bindings for the Cedar policy language.
 #[pymodule]
 fn _cedar_py(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PolicySet>()?;
+    m.add_class::<FrozenPolicySet>()?;
     m.add_class::<PolicyTemplate>()?;
     m.add_class::<Request>()?;
     m.add_class::<Decision>()?;
     m.add_class::<EntityStore>()?;
+    m.add_class::<FrozenEntityStore>()?;
+    m.add_class::<EntityUid>()?;
     m.add_class::<CedarSchema>()?;
     m.add_function(wrap_pyfunction!(validate_policy, m)?)?;
     m.add_function(wrap_pyfunction!(validate_template, m)?)?;
     m.add_function(wrap_pyfunction!(schema::validate_policies, m)?)?;
     m.add_function(wrap_pyfunction!(is_authorized, m)?)?;
+    m.add_function(wrap_pyfunction!(is_authorized_many, m)?)?;
     Ok(())
 }
@@ -0,0 +1,46 @@
+use pyo3::prelude::*;
+use rustc_hash::FxHashMap;
+use std::sync::Mutex;
+
+/// Maximum number of parsed texts kept by each cache.
+const PARSE_CACHE_SIZE: usize = 256;
+
+/// A process-wide cache of parse results, keyed by source text (internal use).
+///
+/// The Cedar grammar is fixed, so a text always parses to the same result;
+/// callers give their copy its own ID. Invalid texts are not cached. When
+/// the cache is full it is cleared, which keeps it bounded without tracking
+/// recency.
+pub(crate) struct ParseCache<T> {
+    entries: Mutex<Option<FxHashMap<String, T>>>,
+}
+
+impl<T: Clone> ParseCache<T> {
+    pub(crate) const fn new() -> Self {
+        ParseCache {
+            entries: Mutex::new(None),
+        }
+    }
+
+    /// Get the parse result for `text`, calling `parse` if it is not cached.
+    pub(crate) fn get_or_parse(
+        &self,
+        text: &str,
+        parse: impl FnOnce(&str) -> PyResult<T>,
+    ) -> PyResult<T> {
+        if let Some(parsed) = self.entries.lock().unwrap().as_ref().and_then(|e| e.get(text)) {
+            return Ok(parsed.clone());
+        }
+
+        // Parse without holding the lock, so other texts can be looked up meanwhile
+        let parsed = parse(text)?;
+
+        let mut entries = self.entries.lock().unwrap();
+        let entries = entries.get_or_insert_with(FxHashMap::default);
+        if entries.len() >= PARSE_CACHE_SIZE {
+            entries.clear();
+        }
+        entries.insert(text.to_owned(), parsed.clone());
+        Ok(parsed)
+    }
+}
@@ -1,10 +1,17 @@
-use cedar_policy::{EntityUid, Policy, PolicyId, PolicySet as CedarPolicySet, SlotId};
+use cedar_policy::{
+    ActionConstraint, EntityTypeName, EntityUid, Policy, PolicyId, PolicySet as CedarPolicySet,
+    Request as CedarRequest, ResourceConstraint, SlotId, Template,
+};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::types::{PyDict, PyTuple};
+use rustc_hash::{FxHashMap, FxHashSet};
 use std::collections::HashMap;
 use std::str::FromStr;
+use std::sync::{Arc, OnceLock, RwLock};
 
+use crate::entity_uid::EntityUidInput;
+use crate::parse_cache::ParseCache;
 use crate::policy_template::PolicyTemplate;
 
 /// A collection of Cedar policies and policy templates.
@@ -13,11 +20,15 @@ use crate::policy_template::PolicyTemplate;
 /// together for authorization decisions. It supports both regular policies
 /// and template-linked policies (policies instantiated from templates).
 #[pyclass]
+#[derive(Clone)]
 pub struct PolicySet {
-    policies: HashMap<String, String>, // Store policy text instead of parsed Policy
-    templates: HashMap<String, String>, // Store template text
-    template_links: HashMap<String, (String, HashMap<String, String>)>, // policy_id -> (template_id, slots)
+    // The maps are shared by copies and copied on their first write (Arc::make_mut)
+    policies: Arc<FxHashMap<String, Policy>>, // Store parsed policies, keyed by ID
+    templates: Arc<FxHashMap<String, Template>>, // Store parsed templates
+    template_links: Arc<FxHashMap<String, (PolicyId, HashMap<SlotId, EntityUid>)>>, // policy_id -> (template_id, parsed slots)
     next_auto_id: usize, // Track next available auto-generated ID
+    version: u64,        // Changes on every mutation
+    compiled: OnceLock<Arc<CompiledPolicySet>>, // Cedar policy sets, built on first use and shared by copies
 }
 
 #[pymethods]
@@ -26,10 +37,12 @@ impl PolicySet {
     #[new]
     fn new() -> Self {
         PolicySet {
-            policies: HashMap::new(),
-            templates: HashMap::new(),
-            template_links: HashMap::new(),
+            policies: Arc::default(),
+            templates: Arc::default(),
+            template_links: Arc::default(),
             next_auto_id: 0,
+            version: crate::next_version(),
+            compiled: OnceLock::new(),
         }
     }
 
@@ -53,28 +66,18 @@ impl PolicySet {
     ///     ...     forbid(principal == User::"banned", action, resource);
     ///     ... ''')
     #[classmethod]
-    fn from_str(_cls: &Bound<'_, pyo3::types::PyType>, policies_text: &str) -> PyResult<Self> {
-        // Parse the policy set to validate and extract individual policies
-        let policy_set = CedarPolicySet::from_str(policies_text)
-            .map_err(|e| PyValueError::new_err(format!("Invalid policy set: {}", e)))?;
-
-        let mut policies_map = HashMap::new();
-
-        // Cedar assigns auto IDs like "policy0", "policy1", etc.
-        // We need to extract each policy and store it with its ID
-        for policy in policy_set.policies() {
-            let policy_id = policy.id().to_string();
-            let policy_text = policy.to_string();
-
-            policies_map.insert(policy_id, policy_text);
-        }
-
-        Ok(PolicySet {
-            policies: policies_map.clone(),
-            templates: HashMap::new(),
-            template_links: HashMap::new(),
-            next_auto_id: policies_map.len(),
-        })
+    fn from_str(
+        _cls: &Bound<'_, pyo3::types::PyType>,
+        py: Python<'_>,
+        policies_text: &str,
+    ) -> PyResult<Self> {
+        // Parse without holding the GIL
+        let parsed = py.allow_threads(|| parse_policy_set(policies_text))?;
+
+        // Policies get the IDs "policy0", "policy1", etc. in order of appearance
+        let mut policy_set = PolicySet::new();
+        policy_set.insert_parsed_policies(parsed);
+        Ok(policy_set)
     }
 
     /// Add a policy to the set.
@@ -84,14 +87,23 @@ impl PolicySet {
     ///     policy_text (str): The Cedar policy text
     ///
     /// Raises:
-    ///     ValueError: If the policy text is invalid
+    ///     ValueError: If the policy text is invalid or the ID is already used
+    ///         by a template or template-linked policy
     fn add_policy(&mut self, policy_id: String, policy_text: &str) -> PyResult<()> {
-        // Validate the policy by parsing it
-        Policy::from_str(policy_text)
-            .map_err(|e| PyValueError::new_err(format!("Invalid policy: {}", e)))?;
+        self.check_id_available(&policy_id, "policy")?;
 
-        // Store the original text
-        self.policies.insert(policy_id, policy_text.to_string());
+        // Re-adding the same text under the same ID leaves the set unchanged
+        if let Some(existing) = self.policies.get(&policy_id) {
+            if existing.to_string() == policy_text {
+                return Ok(());
+            }
+        }
+
+        // Texts parsed before are reused; the parsed form keeps the original text
+        let policy = parse_policy_cached(policy_text)?.new_id(PolicyId::new(&policy_id));
+
+        Arc::make_mut(&mut self.policies).insert(policy_id, policy);
+        self.mark_modified();
         Ok(())
     }
 
@@ -116,26 +128,10 @@ impl PolicySet {
     ///     ...     forbid(principal == User::"banned", action, resource);
     ///     ... ''')
     ///     >>> print(policy_ids)  # ['policy0', 'policy1']
-    fn add_policies_from_str(&mut self, policies_text: &str) -> PyResult<Vec<String>> {
-        // Parse the policy set to validate and extract individual policies
-        let policy_set = CedarPolicySet::from_str(policies_text)
-            .map_err(|e| PyValueError::new_err(format!("Invalid policy set: {}", e)))?;
-
-        let mut added_ids = Vec::new();
-
-        // Assign unique IDs to avoid collisions with existing policies
-        for policy in policy_set.policies() {
-            let policy_text = policy.to_string();
-
-            // Generate unique ID using our counter
-            let unique_id = format!("policy{}", self.next_auto_id);
-            self.next_auto_id += 1;
-
-            self.policies.insert(unique_id.clone(), policy_text);
-            added_ids.push(unique_id);
-        }
-
-        Ok(added_ids)
+    fn add_policies_from_str(slf: &Bound<'_, Self>, policies_text: &str) -> PyResult<Vec<String>> {
+        // Parse without holding the GIL or borrowing the set, then add the results
+        let parsed = slf.py().allow_threads(|| parse_policy_set(policies_text))?;
+        Ok(slf.borrow_mut().insert_parsed_policies(parsed))
     }
     /// Get a policy by its ID.
     ///
@@ -145,7 +141,7 @@ impl PolicySet {
     /// Returns:
     ///     str or None: The policy text, or None if not found
     fn get_policy(&self, policy_id: &str) -> Option<String> {
-        self.policies.get(policy_id).cloned()
+        self.policies.get(policy_id).map(|policy| policy.to_string())
     }
 
     /// Add a policy template to the set.
@@ -153,6 +149,11 @@ impl PolicySet {
     /// Args:
     ///     template (PolicyTemplate): The policy template to add
     ///
+    /// Raises:
+    ///     ValueError: If the template ID is already used by a policy, the
+    ///         text of a template created with eager=False is invalid, or the
+    ///         template replaces one whose linked policies fill other slots
+    ///
     /// Example:
     ///     >>> template = PolicyTemplate("view-template", '''
     ///     ...     permit(
@@ -163,10 +164,19 @@ impl PolicySet {
     ///     ... ''')
     ///     >>> policy_set.add_template(template)
     fn add_template(&mut self, template: &PolicyTemplate) -> PyResult<()> {
-        self.templates.insert(
-            template.get_template_id().to_string(),
-            template.get_template_text().to_string(),
-        );
+        self.check_id_available(template.get_template_id(), "template")?;
+        let parsed = template.get_template()?.clone();
+
+        // Policies linked to a template being replaced must fit the new one
+        let template_id = PolicyId::new(template.get_template_id());
+        for (policy_id, (linked_id, slots)) in self.template_links.iter() {
+            if *linked_id == template_id {
+                check_slots(policy_id, template.get_template_id(), &parsed, slots)?;
+            }
+        }
+
+        Arc::make_mut(&mut self.templates).insert(template.get_template_id().to_string(), parsed);
+        self.mark_modified();
         Ok(())
     }
 
@@ -177,10 +187,13 @@ impl PolicySet {
     /// Args:
     ///     policy_id (str): Unique identifier for the policy
     ///     template_id (str): ID of the template to use
-    ///     slots (dict): Dictionary mapping slot names to entity UIDs
+    ///     slots (dict): Dictionary mapping slot names to entity UIDs, given
+    ///         as strings or as parsed EntityUid objects
     ///
     /// Raises:
-    ///     ValueError: If the template doesn't exist or slot values are invalid
+    ///     ValueError: If the template doesn't exist, the ID is already used
+    ///         by a policy or template, the slots don't match the
+    ///         template's slots, or slot values are invalid
     ///
     /// Example:
     ///     >>> policy_set.add_template_linked_policy(
@@ -194,34 +207,117 @@ impl PolicySet {
         template_id: String,
         slots: &Bound<'_, PyDict>,
     ) -> PyResult<()> {
-        // Check if template exists
-        if !self.templates.contains_key(&template_id) {
-            return Err(PyValueError::new_err(format!(
-                "Template '{}' not found",
-                template_id
-            )));
-        }
+        let link = self.parse_link(&policy_id, &template_id, slots)?;
 
-        // Convert PyDict to HashMap and validate entity UIDs
-        let mut slot_map = HashMap::new();
-        for (key, value) in slots.iter() {
-            let key_str: String = key.extract()?;
-            let value_str: String = value.extract()?;
+        // Store the template link
+        Arc::make_mut(&mut self.template_links).insert(policy_id, link);
+        self.mark_modified();
+        Ok(())
+    }
 
-            // Validate that the value is a valid entity UID
-            EntityUid::from_str(&value_str).map_err(|e| {
-                PyValueError::new_err(format!("Invalid entity UID '{}': {}", value_str, e))
-            })?;
+    /// Add many template-linked policies to the set in one call.
+    ///
+    /// All links are checked before any is added, so if one is invalid the
+    /// set is left unchanged.
+    ///
+    /// Args:
+    ///     links (list): List of (policy_id, template_id, slots) tuples
+    ///
+    /// Raises:
+    ///     ValueError: If a template doesn't exist, an ID is already used
+    ///         by a policy or template, the slots don't match the
+    ///         template's slots, or slot values are invalid
+    ///
+    /// Example:
+    ///     >>> policy_set.add_template_linked_policies([
+    ///     ...     ("alice-view-report", "view-template",
+    ///     ...      {"principal": 'User::"alice"', "resource": 'Document::"report"'}),
+    ///     ...     ("bob-view-data", "view-template",
+    ///     ...      {"principal": 'User::"bob"', "resource": 'Document::"data"'}),
+    ///     ... ])
+    fn add_template_linked_policies(
+        &mut self,
+        links: Vec<(String, String, Bound<'_, PyDict>)>,
+    ) -> PyResult<()> {
+        let parsed = links
+            .into_iter()
+            .map(|(policy_id, template_id, slots)| {
+                let link = self.parse_link(&policy_id, &template_id, &slots)?;
+                Ok((policy_id, link))
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+
+        let template_links = Arc::make_mut(&mut self.template_links);
+        template_links.reserve(parsed.len());
+        template_links.extend(parsed);
+        self.mark_modified();
+        Ok(())
+    }
 
-            slot_map.insert(key_str, value_str);
+    /// Add a template-linked policy, with the slot values given positionally.
+    ///
+    /// The values fill the slots the template declares, in the order
+    /// principal, resource; a template with only one slot takes one value.
+    ///
+    /// Args:
+    ///     policy_id (str): Unique identifier for the policy
+    ///     template_id (str): ID of the template to use
+    ///     *uids (str | EntityUid): Entity UIDs for the template's slots
+    ///
+    /// Raises:
+    ///     ValueError: If the template doesn't exist, the ID is already used
+    ///         by a policy or template, the number of values doesn't match
+    ///         the template's slots, or a value is invalid
+    ///
+    /// Example:
+    ///     >>> policy_set.link(
+    ///     ...     "alice-view-report",
+    ///     ...     "view-template",
+    ///     ...     'User::"alice"',
+    ///     ...     'Document::"report"',
+    ///     ... )
+    #[pyo3(signature = (policy_id, template_id, *uids))]
+    fn link(
+        &mut self,
+        policy_id: String,
+        template_id: String,
+        uids: &Bound<'_, PyTuple>,
+    ) -> PyResult<()> {
+        let template = self.check_link(&policy_id, &template_id)?;
+        let slot_ids = template_slot_ids(template);
+        if uids.len() != slot_ids.len() {
+            return Err(PyValueError::new_err(format!(
+                "Template '{}' has {} slot(s), got {} value(s)",
+                template_id,
+                slot_ids.len(),
+                uids.len()
+            )));
         }
 
-        // Store the template link
-        self.template_links
-            .insert(policy_id, (template_id, slot_map));
+        let slot_map = slot_ids
+            .into_iter()
+            .zip(uids.iter())
+            .map(|(slot_id, uid)| {
+                let uid = uid.extract::<EntityUidInput<'_>>()?.to_cedar_uid()?;
+                Ok((slot_id, uid))
+            })
+            .collect::<PyResult<HashMap<_, _>>>()?;
+
+        Arc::make_mut(&mut self.template_links)
+            .insert(policy_id, (PolicyId::new(&template_id), slot_map));
+        self.mark_modified();
         Ok(())
     }
 
+    /// Version stamp of the policy set (internal use).
+    ///
+    /// The stamp changes whenever the set is modified; an unmodified copy
+    /// keeps the stamp of its source.
+    #[getter(_version)]
+    fn version(&self) -> u64 {
+        self.version
+    }
+
     /// Get the number of policies in the set (including template-linked policies).
     ///
     /// Returns:
@@ -230,22 +326,60 @@ impl PolicySet {
         self.policies.len() + self.template_links.len()
     }
 
+    /// Get all counts of the set in a single call.
+    ///
+    /// Returns:
+    ///     tuple[int, int, int]: The number of static policies, template-linked
+    ///         policies and templates
+    ///
+    /// Example:
+    ///     >>> policies.stats()
+    ///     (2, 0, 0)
+    fn stats(&self) -> (usize, usize, usize) {
+        (
+            self.policies.len(),
+            self.template_links.len(),
+            self.templates.len(),
+        )
+    }
+
     /// String representation of the policy set.
     fn __repr__(&self) -> String {
         format!("PolicySet(policies={})", self.policies.len())
     }
 
+    /// Freeze the policy set into an immutable, pre-compiled handle.
+    ///
+    /// The policies are compiled and indexed once, here. The returned handle
+    /// can be passed to is_authorized and is_authorized_many in place of
+    /// the policy set, and is not affected by later changes to this set.
+    ///
+    /// Returns:
+    ///     FrozenPolicySet: An immutable snapshot of the current policies
+    ///
+    /// Raises:
+    ///     ValueError: If the policies cannot be compiled
+    ///
+    /// Example:
+    ///     >>> frozen = policies.freeze()
+    ///     >>> decision = is_authorized(request, frozen, store)
+    fn freeze(&self) -> PyResult<FrozenPolicySet> {
+        Ok(FrozenPolicySet {
+            compiled: self.get_compiled()?,
+            len: self.__len__(),
+            version: self.version,
+        })
+    }
+
     /// Support for copy.copy() - creates a shallow copy.
     ///
+    /// The copy shares its storage with this set until either is modified,
+    /// so copying is cheap regardless of the number of policies.
+    ///
     /// Returns:
     ///     PolicySet: A new PolicySet instance with copied data
     fn __copy__(&self) -> Self {
-        PolicySet {
-            policies: self.policies.clone(),
-            templates: self.templates.clone(),
-            template_links: self.template_links.clone(),
-            next_auto_id: self.next_auto_id,
-        }
+        self.clone()
     }
 
     /// Support for copy.deepcopy() - creates a deep copy.
@@ -256,110 +390,417 @@ impl PolicySet {
     /// Returns:
     ///     PolicySet: A new PolicySet instance with deeply copied data
     fn __deepcopy__(&self, _memo: &Bound<'_, PyDict>) -> Self {
-        // Since all our data is owned (HashMap of Strings), clone is effectively a deep copy
-        PolicySet {
-            policies: self.policies.clone(),
-            templates: self.templates.clone(),
-            template_links: self.template_links.clone(),
-            next_auto_id: self.next_auto_id,
-        }
+        // Nothing is shared with Python objects, so a clone is already a deep copy
+        self.clone()
     }
 }
 
 impl PolicySet {
-    /// Convert to a Cedar PolicySet (internal use).
-    pub(crate) fn get_cedar_policy_set(&self) -> CedarPolicySet {
-        let mut combined_text = String::new();
-        let mut template_id_map: HashMap<String, String> = HashMap::new();
-        let mut auto_id_counter = 0;
-
-        // Build combined text with all policies
-        for (_id, policy_text) in &self.policies {
-            combined_text.push_str(policy_text);
-            combined_text.push_str("\n\n");
-            auto_id_counter += 1;
+    /// Add policies parsed from a policy set text, assigning each an
+    /// auto-generated ID. Returns the assigned IDs.
+    fn insert_parsed_policies(&mut self, policy_set: CedarPolicySet) -> Vec<String> {
+        let mut added_ids = Vec::new();
+
+        // Assign unique IDs to avoid collisions with existing policies
+        for policy in policy_set.policies() {
+            // Generate unique ID using our counter, skipping IDs already in use
+            let mut unique_id = format!("policy{}", self.next_auto_id);
+            self.next_auto_id += 1;
+            while self.id_owner(&unique_id).is_some() {
+                unique_id = format!("policy{}", self.next_auto_id);
+                self.next_auto_id += 1;
+            }
+
+            // Keep the parsed policy, re-keyed to its new ID
+            let policy = policy.new_id(PolicyId::new(&unique_id));
+            Arc::make_mut(&mut self.policies).insert(unique_id.clone(), policy);
+            added_ids.push(unique_id);
+        }
+
+        self.mark_modified();
+        added_ids
+    }
+
+    /// Check a template link and parse its slots (internal use).
+    ///
+    /// The slot names and entity UIDs are parsed once, when the link is added,
+    /// and the slots must be exactly those the template declares.
+    fn parse_link(
+        &self,
+        policy_id: &str,
+        template_id: &str,
+        slots: &Bound<'_, PyDict>,
+    ) -> PyResult<(PolicyId, HashMap<SlotId, EntityUid>)> {
+        let template = self.check_link(policy_id, template_id)?;
+
+        let mut slot_map = HashMap::with_capacity(slots.len());
+        for (key, value) in slots.iter() {
+            let key_str: String = key.extract()?;
+            let slot_id = slot_id_from_name(&key_str)?;
+
+            // A parsed EntityUid is used as is; a string is parsed here
+            let entity_uid = value.extract::<EntityUidInput<'_>>()?.to_cedar_uid()?;
+            slot_map.insert(slot_id, entity_uid);
+        }
+        check_slots(policy_id, template_id, template, &slot_map)?;
+
+        Ok((PolicyId::new(template_id), slot_map))
+    }
+
+    /// Fail if `template_id` is unknown or `policy_id` is used by another kind of entry.
+    ///
+    /// Returns the template to link.
+    fn check_link(&self, policy_id: &str, template_id: &str) -> PyResult<&Template> {
+        let template = self.templates.get(template_id).ok_or_else(|| {
+            PyValueError::new_err(format!("Template '{}' not found", template_id))
+        })?;
+        self.check_id_available(policy_id, "template-linked policy")?;
+        Ok(template)
+    }
+
+    /// Record a modification: bump the version and drop the compiled policy set.
+    fn mark_modified(&mut self) {
+        self.version = crate::next_version();
+        self.compiled = OnceLock::new();
+    }
+
+    /// Describe the kind of entry that already uses `id`, if any.
+    fn id_owner(&self, id: &str) -> Option<&'static str> {
+        if self.policies.contains_key(id) {
+            Some("policy")
+        } else if self.templates.contains_key(id) {
+            Some("template")
+        } else if self.template_links.contains_key(id) {
+            Some("template-linked policy")
+        } else {
+            None
         }
+    }
 
-        // Add templates to the combined text
-        for (template_id, template_text) in &self.templates {
-            combined_text.push_str(template_text);
-            combined_text.push_str("\n\n");
-            // Track the auto-assigned ID for this template
-            let auto_id = format!("policy{}", auto_id_counter);
-            template_id_map.insert(template_id.clone(), auto_id);
-            auto_id_counter += 1;
+    /// Fail if `id` is already used by an entry of a kind other than `kind`.
+    ///
+    /// Cedar policies, templates and template-linked policies share a single
+    /// ID namespace, while re-adding an entry of the same kind replaces it.
+    fn check_id_available(&self, id: &str, kind: &str) -> PyResult<()> {
+        match self.id_owner(id) {
+            Some(owner) if owner != kind => Err(PyValueError::new_err(format!(
+                "ID '{}' is already used by a {}",
+                id, owner
+            ))),
+            _ => Ok(()),
+        }
+    }
+
+    /// Get the compiled Cedar policy set, building it on first use (internal use).
+    ///
+    /// The compiled set is cached until the next modification, so repeated
+    /// authorizations against an unchanged policy set share one compilation.
+    pub(crate) fn get_compiled(&self) -> PyResult<Arc<CompiledPolicySet>> {
+        if let Some(compiled) = self.compiled.get() {
+            return Ok(compiled.clone());
         }
 
-        // Parse the combined policy set text
-        let mut policy_set = match CedarPolicySet::from_str(&combined_text) {
-            Ok(ps) => ps,
-            Err(e) => {
-                eprintln!("Warning: Failed to parse combined policy set: {}", e);
-                return CedarPolicySet::new();
+        let compiled = self.compile()?;
+        Ok(self.compiled.get_or_init(|| Arc::new(compiled)).clone())
+    }
+
+    /// Build the Cedar policy sets from the stored policies and templates.
+    fn compile(&self) -> PyResult<CompiledPolicySet> {
+        // Template-linked policies, with the slot values parsed when they were added
+        let links: Vec<_> = self
+            .template_links
+            .iter()
+            .map(|(policy_id, (template_id, slots))| (template_id, PolicyId::new(policy_id), slots))
+            .collect();
+
+        // Assemble a Cedar policy set from the entries whose action scope passes `applies`.
+        // Template-linked policies share the action scope of their template.
+        let assemble = |applies: &dyn Fn(&ActionConstraint) -> bool| -> PyResult<CedarPolicySet> {
+            let mut policy_set = CedarPolicySet::new();
+            for policy in self.policies.values() {
+                if applies(&policy.action_constraint()) {
+                    policy_set.add(policy.clone()).map_err(compile_error)?;
+                }
+            }
+            for template in self.templates.values() {
+                if applies(&template.action_constraint()) {
+                    policy_set
+                        .add_template(template.clone())
+                        .map_err(compile_error)?;
+                }
+            }
+            for &(template_id, ref policy_id, slots) in &links {
+                if policy_set.template(template_id).is_some() {
+                    policy_set
+                        .link(template_id.clone(), policy_id.clone(), slots.clone())
+                        .map_err(compile_error)?;
+                }
             }
+            Ok(policy_set)
         };
 
-        // Add template-linked policies
-        for (policy_id, (template_id, slots)) in &self.template_links {
-            // Get the auto-assigned template ID
-            let auto_template_id = match template_id_map.get(template_id) {
-                Some(id) => id,
-                None => {
-                    eprintln!(
-                        "Warning: Template '{}' not found for policy '{}'",
-                        template_id, policy_id
-                    );
-                    continue;
-                }
-            };
+        // Every action named in an `action == ...` scope gets its own partition
+        let mut actions = FxHashSet::default();
+        for constraint in self
+            .policies
+            .values()
+            .map(Policy::action_constraint)
+            .chain(self.templates.values().map(Template::action_constraint))
+        {
+            if let ActionConstraint::Eq(action) = constraint {
+                actions.insert(action);
+            }
+        }
 
-            let tid = match PolicyId::from_str(auto_template_id) {
-                Ok(id) => id,
-                Err(e) => {
-                    eprintln!("Warning: Invalid template ID '{}': {}", auto_template_id, e);
-                    continue;
-                }
-            };
+        let mut by_action = FxHashMap::default();
+        for action in actions {
+            let policy_set = assemble(&|constraint| match constraint {
+                ActionConstraint::Eq(scoped) => scoped == &action,
+                _ => true,
+            })?;
+            by_action.insert(action, Partition::new(policy_set));
+        }
 
-            // Convert slot map to Cedar format
-            let mut cedar_slots = HashMap::new();
-            for (slot_name, entity_uid_str) in slots {
-                let slot_id = match slot_name.as_str() {
-                    "principal" => SlotId::principal(),
-                    "resource" => SlotId::resource(),
-                    _ => {
-                        eprintln!(
-                            "Warning: Unknown slot name '{}' in policy '{}'",
-                            slot_name, policy_id
-                        );
-                        continue;
-                    }
-                };
-
-                if let Ok(entity_uid) = EntityUid::from_str(entity_uid_str) {
-                    cedar_slots.insert(slot_id, entity_uid);
-                } else {
-                    eprintln!(
-                        "Warning: Invalid entity UID '{}' in policy '{}'",
-                        entity_uid_str, policy_id
-                    );
-                }
+        Ok(CompiledPolicySet {
+            all: Arc::new(assemble(&|_| true)?),
+            other_actions: Partition::new(assemble(&|constraint| {
+                !matches!(constraint, ActionConstraint::Eq(_))
+            })?),
+            by_action,
+        })
+    }
+}
+
+/// An immutable, pre-compiled snapshot of a PolicySet.
+///
+/// Created with `PolicySet.freeze()`. Being immutable, it can be shared
+/// freely between threads and needs no checks for modification.
+#[pyclass(frozen)]
+pub struct FrozenPolicySet {
+    compiled: Arc<CompiledPolicySet>,
+    len: usize,
+    version: u64, // Stamp of the source set when frozen; the contents are identical
+}
+
+#[pymethods]
+impl FrozenPolicySet {
+    /// Get the number of policies (including template-linked policies).
+    fn __len__(&self) -> usize {
+        self.len
+    }
+
+    /// String representation of the frozen policy set.
+    fn __repr__(&self) -> String {
+        format!("FrozenPolicySet(policies={})", self.len)
+    }
+
+    /// Version stamp of the policies (internal use).
+    #[getter(_version)]
+    fn version(&self) -> u64 {
+        self.version
+    }
+}
+
+impl FrozenPolicySet {
+    /// Get the compiled Cedar policy set (internal use).
+    pub(crate) fn get_compiled(&self) -> Arc<CompiledPolicySet> {
+        self.compiled.clone()
+    }
+}
+
+/// A compiled Cedar policy set, partitioned by action (internal use).
+///
+/// A policy scoped to `action == X` can only apply to requests for `X`, so
+/// each such action gets its own policy set that leaves out the policies
+/// pinned to other actions. Requests for any other action are evaluated
+/// against the policies whose action scope is unconstrained or uses `in`.
+/// Each partition is further narrowed by resource type, see `Partition`.
+pub(crate) struct CompiledPolicySet {
+    all: Arc<CedarPolicySet>,
+    by_action: FxHashMap<EntityUid, Partition>,
+    other_actions: Partition,
+}
+
+impl CompiledPolicySet {
+    /// Get the complete policy set.
+    pub(crate) fn all(&self) -> &CedarPolicySet {
+        &self.all
+    }
+
+    /// Get the policies that can apply to `request`, by its action and resource type.
+    pub(crate) fn for_request(&self, request: &CedarRequest) -> Arc<CedarPolicySet> {
+        let partition = match request.action() {
+            Some(action) => self.by_action.get(action).unwrap_or(&self.other_actions),
+            None => return self.all.clone(),
+        };
+        match request.resource() {
+            Some(resource) => partition.for_resource_type(resource.type_name()),
+            None => partition.policies.clone(),
+        }
+    }
+}
+
+/// The policies for one action partition, narrowed by resource type on demand.
+///
+/// A policy scoped to `resource == T::"x"` or `resource is T` can only apply
+/// to resources of type `T`. The narrowed sets are built on the first
+/// request for each resource type, so only the types actually requested
+/// are indexed. Template-linked policies are narrowed by their linked
+/// resource, so links of one template to different resource types end up
+/// in different sets.
+struct Partition {
+    policies: Arc<CedarPolicySet>,
+    by_resource_type: RwLock<FxHashMap<EntityTypeName, Arc<CedarPolicySet>>>,
+}
+
+impl Partition {
+    fn new(policies: CedarPolicySet) -> Self {
+        Partition {
+            policies: Arc::new(policies),
+            by_resource_type: RwLock::default(),
+        }
+    }
+
+    /// Get the policies of the partition that can apply to a resource of type `resource_type`.
+    fn for_resource_type(&self, resource_type: &EntityTypeName) -> Arc<CedarPolicySet> {
+        if let Some(policies) = self.by_resource_type.read().unwrap().get(resource_type) {
+            return policies.clone();
+        }
+
+        let applies = |policy: &Policy| match policy.resource_constraint() {
+            ResourceConstraint::Eq(uid) => uid.type_name() == resource_type,
+            ResourceConstraint::Is(scoped) | ResourceConstraint::IsIn(scoped, _) => {
+                &scoped == resource_type
             }
+            // Membership can cross entity types, so `in` scopes always apply
+            _ => true,
+        };
 
-            // Create the linked policy
-            let pid = match PolicyId::from_str(policy_id) {
-                Ok(id) => id,
-                Err(e) => {
-                    eprintln!("Warning: Invalid policy ID '{}': {}", policy_id, e);
-                    continue;
-                }
-            };
+        // Share the whole partition when no policy is left out
+        let policies = if self.policies.policies().all(|policy| applies(policy)) {
+            self.policies.clone()
+        } else {
+            Arc::new(self.narrow(|policy| applies(policy)))
+        };
 
-            policy_set.link(tid, pid, cedar_slots).unwrap_or_else(|e| {
-                eprintln!("Warning: Failed to link policy '{}': {}", policy_id, e);
-            });
+        self.by_resource_type
+            .write()
+            .unwrap()
+            .insert(resource_type.clone(), policies.clone());
+        policies
+    }
+
+    /// Copy the policies that pass `applies` into a new Cedar policy set.
+    ///
+    /// Template-linked policies are re-linked to a copy of their template.
+    /// The entries come from a valid policy set, so adding them cannot fail.
+    fn narrow(&self, applies: impl Fn(&Policy) -> bool) -> CedarPolicySet {
+        const VALID: &str = "entries of a valid policy set can be re-added";
+
+        let mut narrowed = CedarPolicySet::new();
+        for policy in self.policies.policies().filter(|&policy| applies(policy)) {
+            let Some(template_id) = policy.template_id() else {
+                narrowed.add(policy.clone()).expect(VALID);
+                continue;
+            };
+            if narrowed.template(template_id).is_none() {
+                let template = self.policies.template(template_id).expect(VALID);
+                narrowed.add_template(template.clone()).expect(VALID);
+            }
+            narrowed
+                .link(
+                    template_id.clone(),
+                    policy.id().clone(),
+                    policy.template_links().unwrap_or_default(),
+                )
+                .expect(VALID);
         }
+        narrowed
+    }
+}
 
-        policy_set
+/// Parse a Cedar policy set text in a single pass of the Cedar parser.
+fn parse_policy_set(policies_text: &str) -> PyResult<CedarPolicySet> {
+    CedarPolicySet::from_str(policies_text)
+        .map_err(|e| PyValueError::new_err(format!("Invalid policy set: {}", e)))
+}
+
+/// Parse a single policy text, reusing the result for texts parsed before.
+fn parse_policy_cached(policy_text: &str) -> PyResult<Policy> {
+    static CACHE: ParseCache<Policy> = ParseCache::new();
+    CACHE.get_or_parse(policy_text, |text| {
+        Policy::parse(None, text)
+            .map_err(|e| PyValueError::new_err(format!("Invalid policy: {}", e)))
+    })
+}
+
+/// Map a slot name ("principal" or "resource") to its Cedar slot.
+fn slot_id_from_name(slot_name: &str) -> PyResult<SlotId> {
+    match slot_name {
+        "principal" => Ok(SlotId::principal()),
+        "resource" => Ok(SlotId::resource()),
+        _ => Err(PyValueError::new_err(format!(
+            "Unknown slot name '{}', expected 'principal' or 'resource'",
+            slot_name
+        ))),
     }
 }
+
+/// The slots a template declares, in the order principal, resource.
+fn template_slot_ids(template: &Template) -> Vec<SlotId> {
+    [SlotId::principal(), SlotId::resource()]
+        .into_iter()
+        .filter(|slot_id| template.slots().any(|slot| slot == slot_id))
+        .collect()
+}
+
+/// Fail unless `slots` fills exactly the slots of `template`.
+///
+/// Cedar only rejects a mismatched link when the policy set is compiled,
+/// where the error would affect every later use of the whole set.
+fn check_slots(
+    policy_id: &str,
+    template_id: &str,
+    template: &Template,
+    slots: &HashMap<SlotId, EntityUid>,
+) -> PyResult<()> {
+    let expected = template_slot_ids(template);
+    if slots.len() == expected.len() && expected.iter().all(|slot| slots.contains_key(slot)) {
+        return Ok(());
+    }
+
+    let given: Vec<SlotId> = [SlotId::principal(), SlotId::resource()]
+        .into_iter()
+        .filter(|slot| slots.contains_key(slot))
+        .collect();
+    Err(PyValueError::new_err(format!(
+        "Slots of template-linked policy '{}' don't match template '{}': expected {}, got {}",
+        policy_id,
+        template_id,
+        slot_names(&expected),
+        slot_names(&given)
+    )))
+}
+
+/// Join slot names for an error message, e.g. "principal, resource".
+fn slot_names(slot_ids: &[SlotId]) -> String {
+    if slot_ids.is_empty() {
+        return "none".to_string();
+    }
+    slot_ids
+        .iter()
+        .map(|slot| {
+            if *slot == SlotId::principal() {
+                "principal"
+            } else {
+                "resource"
+            }
+        })
+        .collect::<Vec<_>>()
+        .join(", ")
+}
+
+/// Convert a Cedar policy set error into a Python exception.
+fn compile_error(e: impl std::fmt::Display) -> PyErr {
+    PyValueError::new_err(format!("Failed to compile policy set: {}", e))
+}
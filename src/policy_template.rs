@@ -1,9 +1,12 @@
-use cedar_policy::{EntityUid, Template};
+use cedar_policy::{EntityUid, PolicyId, Template};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::types::PyDict;
 use std::collections::HashMap;
 use std::str::FromStr;
+use std::sync::OnceLock;
+
+use crate::parse_cache::ParseCache;
 
 /// A Cedar policy template.
 ///
@@ -26,6 +29,7 @@ use std::str::FromStr;
 pub struct PolicyTemplate {
     template_id: String,
     template_text: String,
+    template: OnceLock<Template>, // Parsed once, reused by every PolicySet it is added to
 }
 
 #[pymethods]
@@ -35,9 +39,12 @@ impl PolicyTemplate {
     /// Args:
     ///     template_id (str): Unique identifier for the template
     ///     template_text (str): The Cedar policy template text with slots
+    ///     eager (bool): Parse the text now (the default). With eager=False
+    ///         the text is parsed when the template is first added to a
+    ///         PolicySet, and an invalid text raises there instead
     ///
     /// Raises:
-    ///     ValueError: If the template text is invalid
+    ///     ValueError: If the template text is invalid and eager is True
     ///
     /// Example:
     ///     >>> template = PolicyTemplate("view-template", '''
@@ -48,15 +55,51 @@ impl PolicyTemplate {
     ///     ...     );
     ///     ... ''')
     #[new]
-    fn new(template_id: String, template_text: &str) -> PyResult<Self> {
-        // Validate the template by parsing it
-        Template::from_str(template_text)
-            .map_err(|e| PyValueError::new_err(format!("Invalid template: {}", e)))?;
-
-        Ok(PolicyTemplate {
+    #[pyo3(signature = (template_id, template_text, eager=true))]
+    fn new(template_id: String, template_text: &str, eager: bool) -> PyResult<Self> {
+        let template = PolicyTemplate {
             template_id,
             template_text: template_text.to_string(),
-        })
+            template: OnceLock::new(),
+        };
+        if eager {
+            template.get_template()?;
+        }
+        Ok(template)
+    }
+
+    /// Create a new policy template from UTF-8 encoded text.
+    ///
+    /// The bytes are read in place, e.g. straight from a template file
+    /// opened in binary mode, without decoding them to a Python str first.
+    ///
+    /// Args:
+    ///     template_id (str): Unique identifier for the template
+    ///     template_text (bytes): The UTF-8 encoded Cedar policy template text
+    ///     eager (bool): Parse the text now (the default), see the constructor
+    ///
+    /// Returns:
+    ///     PolicyTemplate: The new template
+    ///
+    /// Raises:
+    ///     ValueError: If the text is not valid UTF-8, or the template text
+    ///         is invalid and eager is True
+    ///
+    /// Example:
+    ///     >>> with open("view.cedar", "rb") as f:
+    ///     ...     template = PolicyTemplate.from_bytes("view-template", f.read())
+    #[classmethod]
+    #[pyo3(signature = (template_id, template_text, eager=true))]
+    fn from_bytes(
+        _cls: &Bound<'_, pyo3::types::PyType>,
+        template_id: String,
+        template_text: &[u8],
+        eager: bool,
+    ) -> PyResult<Self> {
+        let template_text = std::str::from_utf8(template_text).map_err(|e| {
+            PyValueError::new_err(format!("Template text is not valid UTF-8: {}", e))
+        })?;
+        Self::new(template_id, template_text, eager)
     }
 
     /// Get the template ID.
@@ -120,14 +163,29 @@ impl PolicyTemplate {
     }
 }
 
+/// Parse a template text, reusing the result for texts parsed before (internal use).
+pub(crate) fn parse_template_cached(template_text: &str) -> PyResult<Template> {
+    static CACHE: ParseCache<Template> = ParseCache::new();
+    CACHE.get_or_parse(template_text, |text| {
+        Template::parse(None, text)
+            .map_err(|e| PyValueError::new_err(format!("Invalid template: {}", e)))
+    })
+}
+
 impl PolicyTemplate {
     /// Get the template ID (internal use).
     pub(crate) fn get_template_id(&self) -> &str {
         &self.template_id
     }
 
-    /// Get the template text (internal use).
-    pub(crate) fn get_template_text(&self) -> &str {
-        &self.template_text
+    /// Get the parsed Cedar template, parsing it on first use (internal use).
+    pub(crate) fn get_template(&self) -> PyResult<&Template> {
+        if let Some(template) = self.template.get() {
+            return Ok(template);
+        }
+
+        let template = parse_template_cached(&self.template_text)?
+            .new_id(PolicyId::new(&self.template_id));
+        Ok(self.template.get_or_init(|| template))
     }
 }
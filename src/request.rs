@@ -1,22 +1,27 @@
-use crate::context_utils::py_dict_to_context;
+use crate::context_utils::{json_to_context, py_mapping_to_context};
 use crate::schema::CedarSchema;
-use cedar_policy::{Context, EntityUid, Request as CedarRequest, Schema};
+use cedar_policy::{Context, EntityUid, Request as CedarRequest};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::types::{PyString, PyTuple};
 use std::str::FromStr;
+use std::sync::OnceLock;
 
 /// An authorization request.
 ///
 /// This represents a request to authorize whether a principal can perform
-/// an action on a resource, optionally with additional context.
-#[pyclass]
+/// an action on a resource, optionally with additional context. Requests
+/// are immutable.
+#[pyclass(frozen)]
 pub struct Request {
-    principal: String,
-    action: String,
-    resource: String,
-    context: Option<Context>, // Store the actual Cedar Context
-    schema: Option<Schema>,   // Store the actual Cedar Schema
+    principal: EntityUid, // Entity UIDs are parsed once, at construction
+    action: EntityUid,
+    resource: EntityUid,
+    cedar_request: Result<CedarRequest, String>, // Built and schema-checked once
+    context_key: Option<String>, // Canonical encoding of the context, for fingerprinting
+    schema_version: Option<u64>, // Version stamp of the schema, if any
+    repr: OnceLock<String>,      // Formatted on first repr()
+    fingerprint: OnceLock<Py<PyTuple>>, // Built on first use, with interned UID strings
 }
 
 #[pymethods]
@@ -27,8 +32,15 @@ impl Request {
     ///     principal (str): The principal entity (e.g., 'User::"alice"')
     ///     action (str): The action entity (e.g., 'Action::"view"')
     ///     resource (str): The resource entity (e.g., 'Document::"report"')
-    ///     context (dict, optional): Optional context data as a dictionary
+    ///     context (dict, optional): Optional context data as a dictionary or
+    ///         other mapping (e.g. types.MappingProxyType)
     ///     schema (CedarSchema, optional): Optional schema for request validation
+    ///     context_json (bytes, optional): Context as a UTF-8 encoded JSON
+    ///         object, parsed directly in Rust; an alternative to `context`
+    ///
+    /// Raises:
+    ///     ValueError: If an entity UID or the context is invalid, or if both
+    ///         context and context_json are given
     ///
     /// Example:
     ///     >>> req = Request(
@@ -38,61 +50,185 @@ impl Request {
     ///     ...     context={"ip_address": "192.168.1.1", "authenticated": True}
     ///     ... )
     #[new]
-    #[pyo3(signature = (principal, action, resource, context=None, schema=None))]
+    #[pyo3(signature = (principal, action, resource, context=None, schema=None, context_json=None))]
     fn new(
-        principal: String,
-        action: String,
-        resource: String,
-        context: Option<Bound<'_, PyDict>>,
+        principal: &str,
+        action: &str,
+        resource: &str,
+        context: Option<Bound<'_, PyAny>>,
         schema: Option<&CedarSchema>,
+        context_json: Option<&[u8]>,
     ) -> PyResult<Self> {
-        let cedar_context = if let Some(ctx_dict) = context {
-            Some(py_dict_to_context(&ctx_dict)?)
-        } else {
-            None
+        // Parse the entity UIDs straight from the borrowed Python strings
+        let principal = EntityUid::from_str(principal)
+            .map_err(|e| PyValueError::new_err(format!("Invalid principal: {}", e)))?;
+
+        let action = EntityUid::from_str(action)
+            .map_err(|e| PyValueError::new_err(format!("Invalid action: {}", e)))?;
+
+        let resource = EntityUid::from_str(resource)
+            .map_err(|e| PyValueError::new_err(format!("Invalid resource: {}", e)))?;
+
+        let (cedar_context, context_key) = match (context, context_json) {
+            (Some(_), Some(_)) => {
+                return Err(PyValueError::new_err(
+                    "Pass either context or context_json, not both",
+                ))
+            }
+            (Some(context), None) => {
+                let (ctx, key) = py_mapping_to_context(&context)?;
+                (Some(ctx), Some(key))
+            }
+            (None, Some(json)) => {
+                let (ctx, key) = json_to_context(json)?;
+                (Some(ctx), Some(key))
+            }
+            (None, None) => (None, None),
         };
 
-        let cedar_schema = schema.map(|s| s.get_schema().clone());
+        // Build the Cedar request now, so schema validation runs once per Request.
+        // A validation failure is kept and reported when the request is authorized.
+        let cedar_request = CedarRequest::new(
+            principal.clone(),
+            action.clone(),
+            resource.clone(),
+            cedar_context.unwrap_or_else(Context::empty),
+            schema.map(|s| s.get_schema()),
+        )
+        .map_err(|e| format!("Failed to create request: {}", e));
+        let schema_version = schema.map(|s| s.get_version());
 
         Ok(Request {
             principal,
             action,
             resource,
-            context: cedar_context,
-            schema: cedar_schema,
+            cedar_request,
+            context_key,
+            schema_version,
+            repr: OnceLock::new(),
+            fingerprint: OnceLock::new(),
         })
     }
 
-    /// String representation of the request.
-    fn __repr__(&self) -> String {
-        format!(
-            "Request(principal='{}', action='{}', resource='{}')",
-            self.principal, self.action, self.resource
-        )
+    /// Create a request without context or schema from positional UIDs.
+    ///
+    /// A faster alternative to the constructor for loops that build many
+    /// requests: a static method is called with the fastcall protocol, so no
+    /// argument tuple or keyword dict is built.
+    ///
+    /// Args:
+    ///     principal (str): The principal entity (e.g., 'User::"alice"')
+    ///     action (str): The action entity (e.g., 'Action::"view"')
+    ///     resource (str): The resource entity (e.g., 'Document::"report"')
+    ///
+    /// Returns:
+    ///     Request: The new request
+    ///
+    /// Raises:
+    ///     ValueError: If an entity UID is invalid
+    ///
+    /// Example:
+    ///     >>> req = Request.of('User::"alice"', 'Action::"view"', 'Document::"report"')
+    #[staticmethod]
+    fn of(principal: &str, action: &str, resource: &str) -> PyResult<Self> {
+        Self::new(principal, action, resource, None, None, None)
     }
-}
 
-impl Request {
-    /// Convert to a Cedar Request (internal use).
-    pub(crate) fn to_cedar_request(&self) -> PyResult<CedarRequest> {
-        // Parse the entity UIDs
-        let principal = EntityUid::from_str(&self.principal)
-            .map_err(|e| PyValueError::new_err(format!("Invalid principal: {}", e)))?;
+    /// The principal entity UID (e.g., 'User::"alice"').
+    #[getter]
+    fn principal(&self, py: Python<'_>) -> PyResult<PyObject> {
+        self.fingerprint_item(py, 0)
+    }
 
-        let action = EntityUid::from_str(&self.action)
-            .map_err(|e| PyValueError::new_err(format!("Invalid action: {}", e)))?;
+    /// The action entity UID (e.g., 'Action::"view"').
+    #[getter]
+    fn action(&self, py: Python<'_>) -> PyResult<PyObject> {
+        self.fingerprint_item(py, 1)
+    }
 
-        let resource = EntityUid::from_str(&self.resource)
-            .map_err(|e| PyValueError::new_err(format!("Invalid resource: {}", e)))?;
+    /// The resource entity UID (e.g., 'Document::"report"').
+    #[getter]
+    fn resource(&self, py: Python<'_>) -> PyResult<PyObject> {
+        self.fingerprint_item(py, 2)
+    }
 
-        // Use the stored context or create an empty one
-        let context = self.context.clone().unwrap_or_else(Context::empty);
+    /// Hashable fingerprint of the request (internal use).
+    ///
+    /// Two requests with equal fingerprints always produce the same decision
+    /// for a given policy set and entity store. The tuple is built once, and
+    /// the entity UID strings are interned, so fingerprints of requests for
+    /// the same entities share their strings and compare by identity.
+    #[getter(_fingerprint)]
+    fn fingerprint(&self, py: Python<'_>) -> Py<PyTuple> {
+        self.fingerprint
+            .get_or_init(|| {
+                let items: [PyObject; 5] = [
+                    intern_uid(py, &self.principal),
+                    intern_uid(py, &self.action),
+                    intern_uid(py, &self.resource),
+                    self.context_key.to_object(py),
+                    self.schema_version.to_object(py),
+                ];
+                PyTuple::new_bound(py, items).unbind()
+            })
+            .clone_ref(py)
+    }
 
-        // Get schema reference if available
-        let schema_ref = self.schema.as_ref();
+    /// Hash of the request, consistent with equality.
+    fn __hash__(&self, py: Python<'_>) -> PyResult<isize> {
+        self.fingerprint(py).bind(py).hash()
+    }
 
-        // Build the request
-        CedarRequest::new(principal, action, resource, context, schema_ref)
-            .map_err(|e| PyValueError::new_err(format!("Failed to create request: {}", e)))
+    /// Requests are equal when they have the same entities, the same context
+    /// values and the same schema.
+    fn __eq__(&self, other: &Bound<'_, PyAny>) -> PyObject {
+        let py = other.py();
+        match other.downcast::<Request>() {
+            Ok(other) => {
+                let other = other.get();
+                (self.principal == other.principal
+                    && self.action == other.action
+                    && self.resource == other.resource
+                    && self.context_key == other.context_key
+                    && self.schema_version == other.schema_version)
+                    .into_py(py)
+            }
+            Err(_) => py.NotImplemented(),
+        }
     }
+
+    /// String representation of the request.
+    ///
+    /// Requests are immutable, so the string is formatted once and reused.
+    fn __repr__(&self) -> String {
+        self.repr
+            .get_or_init(|| {
+                format!(
+                    "Request(principal='{}', action='{}', resource='{}')",
+                    self.principal, self.action, self.resource
+                )
+            })
+            .clone()
+    }
+}
+
+impl Request {
+    /// Get an item of the cached fingerprint, e.g. an interned entity UID string.
+    fn fingerprint_item(&self, py: Python<'_>, index: usize) -> PyResult<PyObject> {
+        Ok(self.fingerprint(py).bind(py).get_item(index)?.unbind())
+    }
+
+    /// Get the Cedar Request built at construction (internal use).
+    ///
+    /// Raises the schema validation error, if the request failed validation.
+    pub(crate) fn to_cedar_request(&self) -> PyResult<&CedarRequest> {
+        self.cedar_request
+            .as_ref()
+            .map_err(|e| PyValueError::new_err(e.clone()))
+    }
+}
+
+/// Format an entity UID as an interned Python string.
+fn intern_uid(py: Python<'_>, uid: &EntityUid) -> PyObject {
+    PyString::intern_bound(py, &uid.to_string()).into_any().unbind()
 }
@@ -2,6 +2,7 @@ use cedar_policy::{Schema, ValidationMode, Validator};
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use std::str::FromStr;
+use std::sync::OnceLock;
 
 /// A Cedar schema for policy validation.
 ///
@@ -10,6 +11,8 @@ use std::str::FromStr;
 #[pyclass]
 pub struct CedarSchema {
     schema: Schema,
+    version: u64,
+    validator: OnceLock<Validator>, // Built on first validation, then reused
 }
 
 #[pymethods]
@@ -35,11 +38,18 @@ impl CedarSchema {
     ///     ... '''
     ///     >>> schema = CedarSchema(schema_text)
     #[new]
-    fn new(schema_text: &str) -> PyResult<Self> {
-        let schema = Schema::from_str(schema_text)
-            .map_err(|e| PyValueError::new_err(format!("Invalid schema: {}", e)))?;
+    fn new(py: Python<'_>, schema_text: &str) -> PyResult<Self> {
+        // Parse without holding the GIL
+        let schema = py.allow_threads(|| {
+            Schema::from_str(schema_text)
+                .map_err(|e| PyValueError::new_err(format!("Invalid schema: {}", e)))
+        })?;
 
-        Ok(CedarSchema { schema })
+        Ok(CedarSchema {
+            schema,
+            version: crate::next_version(),
+            validator: OnceLock::new(),
+        })
     }
 
     /// String representation of the schema.
@@ -53,10 +63,23 @@ impl CedarSchema {
     pub(crate) fn get_schema(&self) -> &Schema {
         &self.schema
     }
+
+    /// Get the schema's version stamp (for use within the library).
+    pub(crate) fn get_version(&self) -> u64 {
+        self.version
+    }
+
+    /// Get the validator for this schema, building it on first use.
+    pub(crate) fn get_validator(&self) -> &Validator {
+        self.validator.get_or_init(|| Validator::new(self.schema.clone()))
+    }
 }
 
 /// Validate policies against a schema.
 ///
+/// All policies are validated in a single pass. The validator built from the
+/// schema is kept on the schema and reused by later calls.
+///
 /// Args:
 ///     policies (PolicySet): The policy set to validate
 ///     schema (CedarSchema): The schema to validate against
@@ -75,7 +98,8 @@ impl CedarSchema {
 #[pyfunction]
 #[pyo3(signature = (policies, schema, mode="strict"))]
 pub fn validate_policies(
-    policies: &crate::policy_set::PolicySet,
+    py: Python<'_>,
+    policies: &Bound<'_, crate::policy_set::PolicySet>,
     schema: &CedarSchema,
     mode: &str,
 ) -> PyResult<Vec<String>> {
@@ -90,25 +114,27 @@ pub fn validate_policies(
         }
     };
 
-    // Create validator
-    let validator = Validator::new(schema.get_schema().clone());
+    // Get the compiled Cedar policy set
+    let compiled = policies.borrow().get_compiled()?;
+    let validator = schema.get_validator();
 
-    // Get the Cedar policy set
-    let policy_set = policies.get_cedar_policy_set();
+    // Validate the whole set in one pass without holding the GIL
+    let messages = py.allow_threads(|| {
+        let result = validator.validate(compiled.all(), validation_mode);
 
-    // Validate
-    let result = validator.validate(&policy_set, validation_mode);
+        // Collect errors and warnings
+        let mut messages = Vec::new();
 
-    // Collect errors and warnings
-    let mut messages = Vec::new();
+        for error in result.validation_errors() {
+            messages.push(format!("Error: {}", error));
+        }
 
-    for error in result.validation_errors() {
-        messages.push(format!("Error: {}", error));
-    }
+        for warning in result.validation_warnings() {
+            messages.push(format!("Warning: {}", warning));
+        }
 
-    for warning in result.validation_warnings() {
-        messages.push(format!("Warning: {}", warning));
-    }
+        messages
+    });
 
     Ok(messages)
 }
@@ -10,17 +10,152 @@ This test suite covers all major features of the cedar-py library including:
 - Integration scenarios
 """
 
+import copy
+import json
+from types import MappingProxyType
+
 import pytest
 from cedar_py import (
     CedarSchema,
     EntityStore,
     PolicySet,
+    PolicyTemplate,
     Request,
     is_authorized,
+    is_authorized_many,
     validate_policies,
     validate_policy,
 )
 
+# Entity UIDs used throughout the suite.
+USER_ALICE = 'User::"alice"'
+USER_BOB = 'User::"bob"'
+ACTION_VIEW = 'Action::"view"'
+ACTION_EDIT = 'Action::"edit"'
+ACTION_DELETE = 'Action::"delete"'
+DOC_REPORT = 'Document::"report"'
+GROUP_ADMINS = 'Group::"admins"'
+GROUP_EDITORS = 'Group::"editors"'
+
+# Policies used by several tests, kept compact on a single line.
+PERMIT_ADMINS_DELETE = 'permit(principal in Group::"admins", action == Action::"delete", resource);'
+PERMIT_ALICE_VIEW_REPORT = 'permit(principal == User::"alice", action == Action::"view", resource == Document::"report");'
+PERMIT_ALICE_DELETE_REPORT = 'permit(principal == User::"alice", action == Action::"delete", resource == Document::"report");'
+PERMIT_EDITORS_EDIT = 'permit(principal in Group::"editors", action == Action::"edit", resource);'
+PERMIT_ADMIN_ALL = 'permit(principal == User::"admin", action, resource);'
+
+# Template with principal and resource slots, shared by the template tests.
+VIEW_TEMPLATE = 'permit(principal == ?principal, action == Action::"view", resource == ?resource);'
+
+# Request contexts shared by several tests. Only the top level is read-only, so
+# tests must not modify the nested values either.
+_CTX_IP = MappingProxyType({"ip_address": "192.168.1.1"})
+_CTX_SIMPLE = MappingProxyType(
+    {"ip_address": "192.168.1.1", "authenticated": True, "level": 5}
+)
+_CTX_NESTED = MappingProxyType(
+    {
+        "user_agent": "Mozilla/5.0",
+        "location": {"city": "Seattle", "country": "USA"},
+        "tags": ["urgent", "confidential"],
+    }
+)
+_CTX_NESTED_JSON = json.dumps(dict(_CTX_NESTED)).encode()
+
+# =============================================================================
+# Shared Fixtures
+# =============================================================================
+
+SCHEMA_TEXT_BASIC = """
+entity User;
+entity Document;
+action view appliesTo {
+    principal: [User],
+    resource: [Document]
+};
+"""
+
+SCHEMA_TEXT_FULL = """
+entity User, Group;
+entity Document;
+action view, edit appliesTo {
+    principal: [User, Group],
+    resource: [Document]
+};
+"""
+
+
+# Policy sets shared by several tests. Tests take a copy.copy() of these, so
+# each test can modify its own set without re-parsing the policies.
+_PERMIT_ALL_PS = PolicySet()
+_PERMIT_ALL_PS.add_policy("allow-all", "permit(principal, action, resource);")
+
+_ALICE_VIEW_REPORT_PS = PolicySet()
+_ALICE_VIEW_REPORT_PS.add_policy("allow-alice", PERMIT_ALICE_VIEW_REPORT)
+
+_ADMINS_DELETE_PS = PolicySet()
+_ADMINS_DELETE_PS.add_policy("admins-only", PERMIT_ADMINS_DELETE)
+
+# Read-only; shared as-is by the tests that authorize against it.
+_ALICE_VIEW_BOB_EDIT_PS = PolicySet.from_str(
+    'permit(principal == User::"alice", action == Action::"view", resource);\n'
+    'permit(principal == User::"bob", action == Action::"edit", resource);'
+)
+
+
+@pytest.fixture(scope="session")
+def user_doc_schema():
+    """Schema with User and Document entities and a view action."""
+    return CedarSchema(SCHEMA_TEXT_BASIC)
+
+
+@pytest.fixture(scope="session")
+def full_schema():
+    """Schema with User, Group and Document entities and view/edit actions."""
+    return CedarSchema(SCHEMA_TEXT_FULL)
+
+
+@pytest.fixture(scope="module")
+def base_ps():
+    """Two-policy set that the copy tests copy; never modified itself."""
+    return PolicySet.from_str(
+        """
+        permit(principal, action, resource);
+        forbid(principal == User::"banned", action, resource);
+        """
+    )
+
+
+@pytest.fixture(scope="module")
+def req_alice_view():
+    """Request for alice to view the report."""
+    return Request(
+        principal=USER_ALICE,
+        action=ACTION_VIEW,
+        resource=DOC_REPORT,
+    )
+
+
+@pytest.fixture(scope="module")
+def req_bob_edit():
+    """Request for bob to edit the report."""
+    return Request(
+        principal=USER_BOB,
+        action=ACTION_EDIT,
+        resource=DOC_REPORT,
+    )
+
+
+@pytest.fixture(scope="module")
+def req_alice_edit():
+    """Request for alice to edit the report."""
+    return Request(
+        principal=USER_ALICE,
+        action=ACTION_EDIT,
+        resource=DOC_REPORT,
+    )
+
+
 # =============================================================================
 # Core Policy Tests
 # =============================================================================
@@ -55,6 +190,19 @@ class TestPolicySet:
         ps.add_policy("policy1", "permit(principal, action, resource);")
         assert len(ps) == 1
 
+    def test_readd_same_policy(self):
+        """Test that re-adding a policy unchanged keeps the version stamp."""
+        ps = PolicySet()
+        ps.add_policy("allow-alice", PERMIT_ALICE_VIEW_REPORT)
+        version = ps._version
+
+        ps.add_policy("allow-alice", PERMIT_ALICE_VIEW_REPORT)
+        assert ps._version == version
+
+        ps.add_policy("allow-alice-copy", PERMIT_ALICE_VIEW_REPORT)
+        assert ps._version != version
+        assert ps.get_policy("allow-alice-copy") == ps.get_policy("allow-alice")
+
     def test_add_invalid_policy(self):
         """Test that adding an invalid policy raises ValueError."""
         ps = PolicySet()
@@ -86,6 +234,15 @@ class TestPolicySet:
         ps = PolicySet.from_str(policies_text)
         assert len(ps) == 3
 
+    def test_from_str_policy_ids(self):
+        """Test that from_str assigns sequential IDs and keeps each policy's text."""
+        ps = PolicySet.from_str("""
+        permit(principal, action, resource);
+        forbid(principal == User::"banned", action, resource);
+        """)
+        assert "permit" in ps.get_policy("policy0")
+        assert "banned" in ps.get_policy("policy1")
+
     def test_from_str_single_policy(self):
         """Test creating a PolicySet from string with a single policy."""
         policy_text = "permit(principal, action, resource);"
@@ -101,14 +258,14 @@ class TestPolicySet:
         """Test adding multiple policies to an existing PolicySet."""
         ps = PolicySet()
         ps.add_policy("manual", "permit(principal, action, resource);")
-        assert len(ps) == 1
+        assert ps.stats() == (1, 0, 0)
 
         policies_text = """
         forbid(principal == User::"banned", action, resource);
         permit(principal in Group::"admins", action, resource);
         """
         policy_ids = ps.add_policies_from_str(policies_text)
-        assert len(ps) == 3
+        assert ps.stats() == (3, 0, 0)
         assert len(policy_ids) == 2
         assert all(isinstance(pid, str) for pid in policy_ids)
 
@@ -122,49 +279,57 @@ class TestPolicySet:
         """Test combining from_str classmethod with add_policies_from_str."""
         # Create initial set
         ps = PolicySet.from_str("permit(principal, action, resource);")
-        assert len(ps) == 1
+        assert ps.stats() == (1, 0, 0)
 
         # Add more policies
         policy_ids = ps.add_policies_from_str(
             'forbid(principal == User::"banned", action, resource);'
         )
-        assert len(ps) == 2
+        assert ps.stats() == (2, 0, 0)
         assert len(policy_ids) == 1
 
-    def test_copy(self):
+    def test_copy(self, base_ps):
         """Test shallow copy of PolicySet."""
-        import copy
-
-        ps = PolicySet.from_str("permit(principal, action, resource);")
-        ps_copy = copy.copy(ps)
+        ps_copy = copy.copy(base_ps)
 
-        assert len(ps) == len(ps_copy)
-        assert ps is not ps_copy
+        assert len(base_ps) == len(ps_copy)
+        assert base_ps is not ps_copy
 
         # Modify copy
         ps_copy.add_policy("new", "forbid(principal, action, resource);")
-        assert len(ps_copy) == 2
-        assert len(ps) == 1  # Original unchanged
+        assert len(ps_copy) == 3
+        assert len(base_ps) == 2  # Original unchanged
 
-    def test_deepcopy(self):
-        """Test deep copy of PolicySet."""
-        import copy
+    def test_copy_keeps_decisions(self):
+        """Test that a copy authorizes like the original and diverges after edits."""
+        ps = PolicySet.from_str('permit(principal == User::"alice", action, resource);')
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+        )
+        assert is_authorized(req, ps).is_allowed()
 
-        ps = PolicySet.from_str("""
-            permit(principal, action, resource);
-            forbid(principal == User::"banned", action, resource);
-        """)
-        ps_deepcopy = copy.deepcopy(ps)
+        ps_copy = copy.copy(ps)
+        assert is_authorized(req, ps_copy).is_allowed()
+
+        ps_copy.add_policy("no-alice", 'forbid(principal == User::"alice", action, resource);')
+        assert not is_authorized(req, ps_copy).is_allowed()
+        assert is_authorized(req, ps).is_allowed()
 
-        assert len(ps) == len(ps_deepcopy)
-        assert ps is not ps_deepcopy
+    def test_deepcopy(self, base_ps):
+        """Test deep copy of PolicySet."""
+        ps_deepcopy = copy.deepcopy(base_ps)
+
+        assert base_ps.stats() == ps_deepcopy.stats()
+        assert base_ps is not ps_deepcopy
 
         # Modify deep copy
         policy_ids = ps_deepcopy.add_policies_from_str(
             "permit(principal in Group::\"admins\", action, resource);"
         )
-        assert len(ps_deepcopy) == 3
-        assert len(ps) == 2  # Original unchanged
+        assert ps_deepcopy.stats() == (3, 0, 0)
+        assert base_ps.stats() == (2, 0, 0)  # Original unchanged
         assert len(policy_ids) == 1
 
 
@@ -179,60 +344,98 @@ class TestRequest:
     def test_create_request(self):
         """Test creating a basic request."""
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
-        assert "alice" in repr(req)
-        assert "view" in repr(req)
-        assert "report" in repr(req)
+        assert req.principal == USER_ALICE
+        assert req.action == ACTION_VIEW
+        assert req.resource == DOC_REPORT
+
+    def test_request_of(self):
+        """Test that Request.of builds the same request as the constructor."""
+        req = Request.of(USER_ALICE, ACTION_VIEW, DOC_REPORT)
+        assert req == Request(principal=USER_ALICE, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert req.principal == USER_ALICE
+
+        with pytest.raises(ValueError):
+            Request.of("not-a-valid-uid", ACTION_VIEW, DOC_REPORT)
+
+    def test_request_repr(self):
+        """Test the string representation of a request."""
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+        )
+        assert repr(req) == (
+            f"Request(principal='{USER_ALICE}', action='{ACTION_VIEW}', "
+            f"resource='{DOC_REPORT}')"
+        )
+
+    def test_create_request_invalid_uid(self):
+        """Test that an invalid entity UID is rejected at construction."""
+        with pytest.raises(ValueError, match="Invalid principal"):
+            Request(
+                principal="not-a-valid-uid",
+                action=ACTION_VIEW,
+                resource=DOC_REPORT,
+            )
 
     def test_create_request_with_context(self):
         """Test creating a request with context."""
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
-            context={"ip": "192.168.1.1"},
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=_CTX_IP,
         )
         assert req is not None
 
-    def test_create_request_with_schema(self):
+    def test_create_request_with_schema(self, user_doc_schema):
         """Test creating a request with schema."""
-        schema = CedarSchema("""
-        entity User;
-        entity Document;
-        action view appliesTo {
-            principal: [User],
-            resource: [Document]
-        };
-        """)
-
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
-            schema=schema,
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            schema=user_doc_schema,
         )
         assert req is not None
 
-    def test_create_request_with_context_and_schema(self):
-        """Test creating a request with both context and schema."""
-        schema = CedarSchema("""
-        entity User;
-        entity Document;
-        action view appliesTo {
-            principal: [User],
-            resource: [Document]
-        };
-        """)
+    def test_request_equality(self):
+        """Test that requests with the same content are equal and hash alike."""
+        req1 = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context={"level": 5, "location": {"city": "Seattle", "country": "USA"}},
+        )
+        req2 = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context={"location": {"country": "USA", "city": "Seattle"}, "level": 5},
+        )
+        req3 = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context={"level": 6, "location": {"city": "Seattle", "country": "USA"}},
+        )
 
+        assert req1 == req2
+        assert hash(req1) == hash(req2)
+        assert req1 != req3
+        assert len({req1, req2, req3}) == 2
+
+    def test_create_request_with_context_and_schema(self, user_doc_schema):
+        """Test creating a request with both context and schema."""
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
-            context={"ip_address": "192.168.1.1"},
-            schema=schema,
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=_CTX_IP,
+            schema=user_doc_schema,
         )
         assert req is not None
 
@@ -243,42 +446,143 @@ class TestContext:
     def test_request_with_simple_context(self):
         """Test creating a request with simple context values."""
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
-            context={"ip_address": "192.168.1.1", "authenticated": True, "level": 5},
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=_CTX_SIMPLE,
         )
         assert req is not None
 
     def test_request_with_nested_context(self):
         """Test creating a request with nested context."""
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
-            context={
-                "user_agent": "Mozilla/5.0",
-                "location": {"city": "Seattle", "country": "USA"},
-                "tags": ["urgent", "confidential"],
-            },
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=_CTX_NESTED,
         )
         assert req is not None
 
+    def test_request_with_json_context(self):
+        """Test that a JSON context is evaluated like the equivalent dict."""
+        ps = PolicySet.from_str(
+            'permit(principal, action, resource) when { context.location.city == "Seattle" };'
+        )
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context_json=_CTX_NESTED_JSON,
+        )
+        assert is_authorized(req, ps).is_allowed()
+
+        with pytest.raises(ValueError):
+            Request(
+                principal=USER_ALICE,
+                action=ACTION_VIEW,
+                resource=DOC_REPORT,
+                context=_CTX_NESTED,
+                context_json=_CTX_NESTED_JSON,
+            )
+
+    def test_request_with_mapping_context(self):
+        """Test that a read-only mapping works like the equivalent dict."""
+        from_proxy = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=_CTX_NESTED,
+        )
+        from_dict = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=dict(_CTX_NESTED),
+        )
+        assert from_proxy == from_dict
+
+    def test_request_with_nested_mapping_context(self):
+        """Test that a read-only mapping nested in a context works like a dict."""
+        ps = PolicySet.from_str(
+            'permit(principal, action, resource) when { context.location.city == "Seattle" };'
+        )
+        from_proxy = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context={"location": MappingProxyType({"city": "Seattle", "country": "USA"})},
+        )
+        from_dict = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context={"location": {"city": "Seattle", "country": "USA"}},
+        )
+        assert from_proxy == from_dict
+        assert is_authorized(from_proxy, ps).is_allowed()
+
     def test_authorization_with_context(self):
         """Test that authorization works with context (even if not used in policy)."""
-        ps = PolicySet()
-        ps.add_policy("allow", "permit(principal, action, resource);")
+        ps = copy.copy(_PERMIT_ALL_PS)
 
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
             context={"source": "api"},
         )
 
         decision = is_authorized(req, ps)
         assert decision.is_allowed()
 
+    def test_context_values_used_in_policy(self):
+        """Test that nested context values reach policy evaluation."""
+        ps = PolicySet.from_str(
+            """
+            permit(principal, action, resource)
+            when {
+                context.authenticated &&
+                context.level >= 5 &&
+                context.location.city == "Seattle" &&
+                context.tags.contains("urgent")
+            };
+            """
+        )
+        context = {
+            "authenticated": True,
+            "level": 5,
+            "location": {"city": "Seattle"},
+            "tags": ["urgent"],
+        }
+
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=context,
+        )
+        assert is_authorized(req, ps).is_allowed()
+
+        context["level"] = 4
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
+            context=context,
+        )
+        assert not is_authorized(req, ps).is_allowed()
+
+    def test_unsupported_context_value(self):
+        """Test that unsupported context values raise ValueError."""
+        for value in [None, 1.5, object()]:
+            with pytest.raises(ValueError):
+                Request(
+                    principal=USER_ALICE,
+                    action=ACTION_VIEW,
+                    resource=DOC_REPORT,
+                    context={"value": value},
+                )
+
 
 # =============================================================================
 # Authorization Tests
@@ -290,16 +594,12 @@ class TestAuthorization:
 
     def test_allow_decision(self):
         """Test an authorization that should be allowed."""
-        ps = PolicySet()
-        ps.add_policy(
-            "allow-alice",
-            'permit(principal == User::"alice", action == Action::"view", resource == Document::"report");',
-        )
+        ps = copy.copy(_ALICE_VIEW_REPORT_PS)
 
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
 
         decision = is_authorized(req, ps)
@@ -308,60 +608,186 @@ class TestAuthorization:
 
     def test_deny_decision(self):
         """Test an authorization that should be denied."""
-        ps = PolicySet()
-        ps.add_policy(
-            "allow-alice-only",
-            'permit(principal == User::"alice", action == Action::"view", resource == Document::"report");',
-        )
+        ps = copy.copy(_ALICE_VIEW_REPORT_PS)
 
         req = Request(
-            principal='User::"bob"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_BOB,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
 
         decision = is_authorized(req, ps)
         assert decision.decision == "Deny"
         assert decision.is_allowed() is False
 
-    def test_multiple_policies(self):
+    @pytest.mark.parametrize(
+        "request_fixture, expected",
+        [
+            ("req_alice_view", True),  # Alice can view
+            ("req_bob_edit", True),  # Bob can edit
+            ("req_alice_edit", False),  # Alice cannot edit (no policy allows it)
+        ],
+    )
+    def test_multiple_policies(self, request, request_fixture, expected):
         """Test authorization with multiple policies."""
+        req = request.getfixturevalue(request_fixture)
+        decision = is_authorized(req, _ALICE_VIEW_BOB_EDIT_PS)
+        assert decision.is_allowed() is expected
+
+    def test_action_scoped_policies(self):
+        """Test policies scoped to different actions alongside unscoped ones."""
         ps = PolicySet()
         ps.add_policy(
-            "allow-alice-view",
-            'permit(principal == User::"alice", action == Action::"view", resource);',
+            "view-reports",
+            'permit(principal, action == Action::"view", resource);',
+        )
+        ps.add_policy(
+            "edit-in-group",
+            'permit(principal, action in [Action::"edit"], resource);',
         )
         ps.add_policy(
-            "allow-bob-edit",
-            'permit(principal == User::"bob", action == Action::"edit", resource);',
+            "no-bob",
+            'forbid(principal == User::"bob", action, resource);',
         )
 
-        # Alice can view
-        req1 = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+        def decide(principal, action):
+            req = Request(
+                principal=principal, action=action, resource=DOC_REPORT
+            )
+            return is_authorized(req, ps)
+
+        view = decide(USER_ALICE, ACTION_VIEW)
+        assert view.is_allowed()
+        assert "Reason: view-reports" in view.diagnostics
+
+        assert decide(USER_ALICE, ACTION_EDIT).is_allowed()
+        assert not decide(USER_ALICE, ACTION_DELETE).is_allowed()
+        assert not decide(USER_BOB, ACTION_VIEW).is_allowed()
+
+    def test_resource_scoped_policies(self):
+        """Test policies scoped to different resource types and linked resources."""
+        ps = PolicySet()
+        ps.add_policy("view-docs", 'permit(principal, action, resource is Document);')
+        ps.add_policy("no-photo", 'forbid(principal, action, resource == Photo::"beach");')
+        ps.add_policy("in-album", 'permit(principal, action, resource in Album::"trip");')
+        ps.add_template(
+            PolicyTemplate("resource-template", "permit(principal, action, resource == ?resource);")
+        )
+        ps.add_template_linked_policy(
+            "video", "resource-template", {"resource": 'Video::"intro"'}
         )
-        decision1 = is_authorized(req1, ps)
-        assert decision1.is_allowed() is True
+        store = EntityStore()
+        store.add_entity('Photo::"sunset"', parents=['Album::"trip"'])
+        store.add_entity('Photo::"beach"', parents=['Album::"trip"'])
+
+        def decide(resource):
+            req = Request(principal=USER_ALICE, action=ACTION_VIEW, resource=resource)
+            return is_authorized(req, ps, store).is_allowed()
+
+        assert decide(DOC_REPORT)
+        assert decide('Video::"intro"')
+        assert not decide('Video::"outro"')
+        assert decide('Photo::"sunset"')
+        assert not decide('Photo::"beach"')
+
+    def test_wrong_argument_types(self, req_alice_view):
+        """Test that arguments of the wrong type raise TypeError."""
+        with pytest.raises(TypeError):
+            is_authorized(req_alice_view, "not a policy set")
+        with pytest.raises(TypeError):
+            is_authorized(req_alice_view, None)
+        with pytest.raises(TypeError):
+            is_authorized(req_alice_view, _PERMIT_ALL_PS, {})
+        with pytest.raises(TypeError):
+            is_authorized("not a request", _PERMIT_ALL_PS)
+
+    def test_is_authorized_many(self, req_alice_view, req_bob_edit, req_alice_edit):
+        """Test batch authorization returns one decision per request, in order."""
+        requests = [req_alice_view, req_bob_edit, req_alice_edit]
+
+        decisions = is_authorized_many(requests, _ALICE_VIEW_BOB_EDIT_PS)
+        assert [d.is_allowed() for d in decisions] == [True, True, False]
+
+    def test_is_authorized_many_parallel(self, req_alice_view, req_bob_edit, req_alice_edit):
+        """Test that a batch large enough to run in parallel keeps the request order."""
+        requests = [req_alice_view, req_bob_edit, req_alice_edit] * 6
+
+        decisions = is_authorized_many(requests, _ALICE_VIEW_BOB_EDIT_PS)
+        assert [d.is_allowed() for d in decisions] == [True, True, False] * 6
+
+    def test_is_authorized_many_empty(self):
+        """Test batch authorization with no requests."""
+        ps = PolicySet()
+        assert is_authorized_many([], ps) == []
 
-        # Bob can edit
-        req2 = Request(
-            principal='User::"bob"',
-            action='Action::"edit"',
-            resource='Document::"report"',
+    def test_authorize_while_modifying_from_threads(self):
+        """Test authorizing from several threads while another modifies the sets."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        ps = PolicySet.from_str('permit(principal == User::"alice", action, resource);')
+        store = EntityStore()
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
-        decision2 = is_authorized(req2, ps)
-        assert decision2.is_allowed() is True
 
-        # Alice cannot edit (no policy allows it)
-        req3 = Request(
-            principal='User::"alice"',
-            action='Action::"edit"',
-            resource='Document::"report"',
+        def authorize(i):
+            return is_authorized(req, ps, store).is_allowed()
+
+        def modify():
+            for i in range(50):
+                ps.add_policy(f"extra{i}", f'permit(principal == User::"u{i}", action, resource);')
+                store.add_entity(f'User::"u{i}"')
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            writer = pool.submit(modify)
+            results = list(pool.map(authorize, range(200)))
+            writer.result()
+
+        assert all(results)
+        assert len(ps) == 51
+
+    def test_decision_refreshed_after_policy_change(self):
+        """Test that adding a policy invalidates previously cached decisions."""
+        ps = PolicySet()
+        ps.add_policy(
+            "allow-alice",
+            'permit(principal == User::"alice", action, resource);',
+        )
+
+        req = Request(
+            principal=USER_BOB,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
-        decision3 = is_authorized(req3, ps)
-        assert decision3.is_allowed() is False
+        assert is_authorized(req, ps).is_allowed() is False
+
+        ps.add_policy("allow-bob", 'permit(principal == User::"bob", action, resource);')
+        assert is_authorized(req, ps).is_allowed() is True
+
+    def test_frozen_handles_are_snapshots(self):
+        """Test that frozen policies and entities ignore later changes to their source."""
+        ps = PolicySet.from_str(PERMIT_ADMINS_DELETE)
+        store = EntityStore()
+        store.add_entity(USER_ALICE, parents=[GROUP_ADMINS])
+        frozen_ps = ps.freeze()
+        frozen_store = store.freeze()
+        assert len(frozen_ps) == 1
+        assert len(frozen_store) == 1
+
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
+        )
+        assert is_authorized(req, frozen_ps, frozen_store).is_allowed()
+        assert is_authorized_many([req], frozen_ps, frozen_store)[0].is_allowed()
+
+        ps.add_policy("no-alice", 'forbid(principal == User::"alice", action, resource);')
+        store.clear()
+        assert is_authorized(req, frozen_ps, frozen_store).is_allowed()
+        assert not is_authorized(req, ps, store).is_allowed()
 
 
 class TestDecision:
@@ -369,13 +795,12 @@ class TestDecision:
 
     def test_decision_bool_conversion(self):
         """Test that Decision can be used as a boolean."""
-        ps = PolicySet()
-        ps.add_policy("allow-all", "permit(principal, action, resource);")
+        ps = copy.copy(_PERMIT_ALL_PS)
 
         req = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
 
         decision = is_authorized(req, ps)
@@ -403,87 +828,127 @@ class TestEntityStore:
     def test_add_entity(self):
         """Test adding entities to the store."""
         store = EntityStore()
-        store.add_entity('User::"alice"')
+        store.add_entity(USER_ALICE)
         assert len(store) == 1
 
     def test_add_entity_with_attributes(self):
         """Test adding entity with attributes."""
         store = EntityStore()
         store.add_entity(
-            'User::"alice"', attrs={"email": "alice@example.com", "age": 30}
+            USER_ALICE, attrs={"email": "alice@example.com", "age": 30}
         )
         assert len(store) == 1
 
     def test_add_entity_with_parents(self):
         """Test adding entity with parent relationships."""
         store = EntityStore()
-        store.add_entity('Group::"admins"')
-        store.add_entity('User::"alice"', parents=['Group::"admins"'])
+        store.add_entity(GROUP_ADMINS)
+        store.add_entity(USER_ALICE, parents=[GROUP_ADMINS])
+        assert len(store) == 2
+
+    def test_add_entities_invalid_leaves_store_unchanged(self):
+        """Test that a bulk add with an invalid entry adds nothing."""
+        store = EntityStore()
+        store.add_entity(USER_ALICE)
+        with pytest.raises(ValueError):
+            store.add_entities([(USER_BOB, None, None), ("not-a-valid-uid", None, None)])
+        assert len(store) == 1
+
+    def test_add_entity_replaces_existing(self):
+        """Test that re-adding an entity replaces it instead of duplicating it."""
+        store = EntityStore()
+        store.add_entity(GROUP_ADMINS)
+        store.add_entity(USER_ALICE)
+        store.add_entity(USER_ALICE, parents=[GROUP_ADMINS])
         assert len(store) == 2
 
     def test_hierarchical_authorization(self):
         """Test authorization using entity hierarchies."""
         # Create entities
         store = EntityStore()
-        store.add_entity('Group::"admins"')
-        store.add_entity('User::"alice"', parents=['Group::"admins"'])
+        store.add_entities([(GROUP_ADMINS, None, None), (USER_ALICE, None, [GROUP_ADMINS])])
 
         # Create policy that checks group membership
-        ps = PolicySet()
-        ps.add_policy(
-            "admins-only",
-            """
-            permit(
-                principal in Group::"admins",
-                action == Action::"delete",
-                resource
-            );
-        """,
-        )
+        ps = copy.copy(_ADMINS_DELETE_PS)
 
         # Alice should be allowed because she's in the admins group
         req = Request(
-            principal='User::"alice"',
-            action='Action::"delete"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
         )
 
         decision = is_authorized(req, ps, store)
         assert decision.is_allowed()
 
+    def test_transitive_hierarchy(self):
+        """Test that membership is resolved through several levels of parents."""
+        store = EntityStore()
+        store.add_entities(
+            [
+                (GROUP_ADMINS, None, None),
+                ('Group::"ops"', None, [GROUP_ADMINS]),
+                ('Group::"oncall"', None, ['Group::"ops"']),
+                (USER_ALICE, None, ['Group::"oncall"']),
+            ]
+        )
+
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
+        )
+        assert is_authorized(req, _ADMINS_DELETE_PS, store).is_allowed()
+
     def test_non_member_denied(self):
         """Test that non-members are denied."""
         store = EntityStore()
-        store.add_entity('Group::"admins"')
-        store.add_entity('User::"alice"', parents=['Group::"admins"'])
-        store.add_entity('User::"bob"')  # Not in admins group
+        store.add_entities(
+            [
+                (GROUP_ADMINS, None, None),
+                (USER_ALICE, None, [GROUP_ADMINS]),
+                (USER_BOB, None, None),  # Not in admins group
+            ]
+        )
+
+        ps = copy.copy(_ADMINS_DELETE_PS)
+
+        req = Request(
+            principal=USER_BOB,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
+        )
+
+        decision = is_authorized(req, ps, store)
+        assert not decision.is_allowed()
+
+    def test_decision_refreshed_after_entity_change(self):
+        """Test that adding an entity invalidates previously cached decisions."""
+        store = EntityStore()
+        store.add_entity(GROUP_ADMINS)
+        store.add_entity(USER_BOB)
 
         ps = PolicySet()
         ps.add_policy(
             "admins-only",
-            """
-            permit(
-                principal in Group::"admins",
-                action == Action::"delete",
-                resource
-            );
-        """,
+            'permit(principal in Group::"admins", action, resource);',
         )
 
         req = Request(
-            principal='User::"bob"',
-            action='Action::"delete"',
-            resource='Document::"report"',
+            principal=USER_BOB,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
         )
+        assert not is_authorized(req, ps, store).is_allowed()
 
-        decision = is_authorized(req, ps, store)
-        assert not decision.is_allowed()
+        store.add_entity(USER_BOB, parents=[GROUP_ADMINS])
+        assert is_authorized(req, ps, store).is_allowed()
 
     def test_clear_entities(self):
         """Test clearing all entities from the store."""
         store = EntityStore()
-        store.add_entity('User::"alice"')
-        store.add_entity('User::"bob"')
+        store.add_entity(USER_ALICE)
+        store.add_entity(USER_BOB)
         assert len(store) == 2
 
         store.clear()
@@ -515,60 +980,51 @@ class TestSchemaValidation:
         with pytest.raises(ValueError):
             CedarSchema("this is not a valid schema")
 
-    def test_validate_correct_policies(self):
+    def test_validate_correct_policies(self, user_doc_schema):
         """Test validating correct policies against schema."""
-        schema = CedarSchema("""
-        entity User;
-        entity Document;
-        action view appliesTo {
-            principal: [User],
-            resource: [Document]
-        };
-        """)
-
         ps = PolicySet()
-        ps.add_policy(
-            "policy1",
-            """
-            permit(
-                principal == User::"alice",
-                action == Action::"view",
-                resource == Document::"report"
-            );
-        """,
-        )
+        ps.add_policy("policy1", PERMIT_ALICE_VIEW_REPORT)
 
-        errors = validate_policies(ps, schema)
+        errors = validate_policies(ps, user_doc_schema)
         # May have warnings but should validate
         assert errors is not None  # Returns list, might be empty or have warnings
 
-    def test_validate_incorrect_policies(self):
+    def test_validate_incorrect_policies(self, user_doc_schema):
         """Test validating policies with schema violations."""
-        schema = CedarSchema("""
-        entity User;
-        entity Document;
-        action view appliesTo {
-            principal: [User],
-            resource: [Document]
-        };
-        """)
-
         ps = PolicySet()
         # This policy references an action not in the schema
-        ps.add_policy(
-            "policy1",
-            """
-            permit(
-                principal == User::"alice",
-                action == Action::"delete",
-                resource == Document::"report"
-            );
-        """,
-        )
+        ps.add_policy("policy1", PERMIT_ALICE_DELETE_REPORT)
 
-        errors = validate_policies(ps, schema)
+        errors = validate_policies(ps, user_doc_schema)
         assert len(errors) > 0  # Should have validation errors
 
+    def test_validate_reuses_schema(self, user_doc_schema):
+        """Test validating several policy sets against the same schema."""
+        good = PolicySet.from_str(
+            'permit(principal, action == Action::"view", resource);'
+        )
+        bad = PolicySet.from_str(
+            'permit(principal, action == Action::"delete", resource);'
+        )
+
+        assert validate_policies(good, user_doc_schema) == []
+        assert len(validate_policies(bad, user_doc_schema)) > 0
+        assert validate_policies(good, user_doc_schema) == []
+
+    def test_request_schema_error_raised_on_authorization(self, user_doc_schema):
+        """Test that a request failing schema validation raises when authorized."""
+        ps = PolicySet.from_str("permit(principal, action, resource);")
+
+        req = Request(
+            principal=USER_ALICE,
+            action=ACTION_DELETE,
+            resource=DOC_REPORT,
+            schema=user_doc_schema,
+        )
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                is_authorized(req, ps)
+
 
 # =============================================================================
 # Integration Tests
@@ -578,47 +1034,30 @@ class TestSchemaValidation:
 class TestIntegration:
     """Integration tests combining multiple features."""
 
-    def test_full_stack(self):
+    def test_full_stack(self, full_schema):
         """Test complete workflow with schema, entities, context, and policies."""
-        # Schema
-        schema = CedarSchema("""
-        entity User, Group;
-        entity Document;
-        action view, edit appliesTo {
-            principal: [User, Group],
-            resource: [Document]
-        };
-        """)
-
         # Entities
         entities = EntityStore()
-        entities.add_entity('Group::"editors"')
-        entities.add_entity(
-            'User::"alice"', attrs={"role": "editor"}, parents=['Group::"editors"']
+        entities.add_entities(
+            [
+                (GROUP_EDITORS, None, None),
+                (USER_ALICE, {"role": "editor"}, [GROUP_EDITORS]),
+                ('Document::"doc1"', {"owner": "alice"}, None),
+            ]
         )
-        entities.add_entity('Document::"doc1"', attrs={"owner": "alice"})
 
         # Policies
         policies = PolicySet()
-        policies.add_policy(
-            "editors-can-edit",
-            """
-            permit(
-                principal in Group::"editors",
-                action == Action::"edit",
-                resource
-            );
-        """,
-        )
+        policies.add_policy("editors-can-edit", PERMIT_EDITORS_EDIT)
 
         # Validate
-        validate_policies(policies, schema)
+        validate_policies(policies, full_schema)
         # Should validate (may have warnings)
 
         # Authorize with context
         req = Request(
-            principal='User::"alice"',
-            action='Action::"edit"',
+            principal=USER_ALICE,
+            action=ACTION_EDIT,
             resource='Document::"doc1"',
             context={"timestamp": "2025-12-10T10:00:00Z"},
         )
@@ -639,16 +1078,7 @@ class TestPolicyTemplate:
         """Test creating a policy template."""
         from cedar_py import PolicyTemplate
 
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
         assert template.template_id == "view-template"
         assert "?principal" in template.template_text
         assert "?resource" in template.template_text
@@ -660,18 +1090,45 @@ class TestPolicyTemplate:
         with pytest.raises(ValueError):
             PolicyTemplate("bad-template", "this is not a valid template")
 
+    def test_template_from_bytes(self):
+        """Test creating a template from UTF-8 encoded text."""
+        from cedar_py import PolicyTemplate
+
+        template_text = "permit(principal == ?principal, action, resource);"
+        template = PolicyTemplate.from_bytes("bytes-template", template_text.encode())
+        assert template.template_text == template_text
+
+        with pytest.raises(ValueError):
+            PolicyTemplate.from_bytes("bad-bytes", b"\xff\xfe")
+
+    def test_lazy_template(self):
+        """Test that a lazy template reports an invalid text when it is added."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        template = PolicyTemplate("bad-template", "this is not a valid template", eager=False)
+        assert template.template_id == "bad-template"
+        with pytest.raises(ValueError):
+            PolicySet().add_template(template)
+
     def test_validate_template(self):
         """Test template validation function."""
         from cedar_py import validate_template
 
-        template_text = """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """
-        assert validate_template(template_text) is True
+        assert validate_template(VIEW_TEMPLATE) is True
+
+    def test_templates_with_same_text(self):
+        """Test that templates sharing a text keep their own IDs."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        template_text = 'permit(principal == ?principal, action, resource);'
+        ps = PolicySet()
+        ps.add_template(PolicyTemplate("first", template_text))
+        ps.add_template(PolicyTemplate("second", template_text))
+        ps.add_template_linked_policy("alice", "first", {"principal": USER_ALICE})
+        ps.add_template_linked_policy("bob", "second", {"principal": USER_BOB})
+
+        req = Request(principal=USER_BOB, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert is_authorized(req, ps).is_allowed()
 
     def test_validate_invalid_template(self):
         """Test that invalid template fails validation."""
@@ -689,16 +1146,7 @@ class TestTemplateLinking:
         from cedar_py import PolicySet, PolicyTemplate
 
         ps = PolicySet()
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
         # Template added successfully
@@ -708,26 +1156,18 @@ class TestTemplateLinking:
         from cedar_py import PolicySet, PolicyTemplate
 
         ps = PolicySet()
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
         ps.add_template_linked_policy(
             "alice-view-report",
             "view-template",
-            {"principal": 'User::"alice"', "resource": 'Document::"report"'},
+            {"principal": USER_ALICE, "resource": DOC_REPORT},
         )
 
         # Policy linked successfully
         assert len(ps) == 1
+        assert ps.stats() == (0, 1, 1)
 
     def test_template_not_found(self):
         """Test error when template doesn't exist."""
@@ -738,24 +1178,193 @@ class TestTemplateLinking:
             ps.add_template_linked_policy(
                 "policy1",
                 "nonexistent-template",
-                {"principal": 'User::"alice"'},
+                {"principal": USER_ALICE},
             )
 
-    def test_invalid_entity_uid_in_slot(self):
-        """Test error with invalid entity UID in slot."""
+    def test_unknown_slot_name(self):
+        """Test error with a slot name other than principal or resource."""
         from cedar_py import PolicySet, PolicyTemplate
 
         ps = PolicySet()
+        ps.add_template(
+            PolicyTemplate(
+                "view-template",
+                'permit(principal == ?principal, action, resource == ?resource);',
+            )
+        )
+        with pytest.raises(ValueError, match="Unknown slot name"):
+            ps.add_template_linked_policy(
+                "policy1",
+                "view-template",
+                {"principal": USER_ALICE, "owner": USER_BOB},
+            )
+
+    def test_id_shared_across_kinds(self):
+        """Test that policies, templates and linked policies cannot share an ID."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_policy("shared", "permit(principal, action, resource);")
         template = PolicyTemplate(
             "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
+            'permit(principal == ?principal, action, resource == ?resource);',
         )
+        ps.add_template(template)
+
+        with pytest.raises(ValueError, match="already used"):
+            ps.add_template_linked_policy(
+                "shared",
+                "view-template",
+                {"principal": USER_ALICE, "resource": 'Document::"doc"'},
+            )
+        with pytest.raises(ValueError, match="already used"):
+            ps.add_policy("view-template", "permit(principal, action, resource);")
+
+    def test_link_with_parsed_entity_uids(self):
+        """Test that parsed EntityUid objects can be reused as slot values."""
+        from cedar_py import EntityUid, PolicySet, PolicyTemplate
+
+        alice = EntityUid(USER_ALICE)
+        assert alice == EntityUid(USER_ALICE)
+        assert str(alice) == USER_ALICE
+
+        ps = PolicySet()
+        ps.add_template(
+            PolicyTemplate(
+                "resource-template",
+                "permit(principal == ?principal, action, resource == ?resource);",
+            )
+        )
+        ps.add_template_linked_policies(
+            [
+                ("alice-report", "resource-template", {"principal": alice, "resource": DOC_REPORT}),
+                ("alice-data", "resource-template", {"principal": alice, "resource": 'Document::"data"'}),
+            ]
+        )
+
+        req = Request(principal=USER_ALICE, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert is_authorized(req, ps).is_allowed()
+
+    def test_bulk_links_invalid_leaves_set_unchanged(self):
+        """Test that one invalid link in a batch adds none of them."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_template(
+            PolicyTemplate("view-template", 'permit(principal == ?principal, action, resource);')
+        )
+        with pytest.raises(ValueError):
+            ps.add_template_linked_policies(
+                [
+                    ("alice", "view-template", {"principal": USER_ALICE}),
+                    ("bob", "missing-template", {"principal": USER_BOB}),
+                ]
+            )
+        assert len(ps) == 0
+
+    def test_bulk_links_slot_mismatch_leaves_set_unchanged(self):
+        """Test that a batch with one wrong slot set adds none of its links."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_template(PolicyTemplate("view-template", VIEW_TEMPLATE))
+        ps.add_template_linked_policy(
+            "alice-view-report",
+            "view-template",
+            {"principal": USER_ALICE, "resource": DOC_REPORT},
+        )
+
+        with pytest.raises(ValueError, match="don't match template"):
+            ps.add_template_linked_policies(
+                [
+                    ("bob-view-report", "view-template", {"principal": USER_BOB, "resource": DOC_REPORT}),
+                    ("bob-view-all", "view-template", {"principal": USER_BOB}),
+                ]
+            )
+
+        assert len(ps) == 1
+        req = Request(principal=USER_ALICE, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert is_authorized(req, ps).is_allowed()
+        req = Request(principal=USER_BOB, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert not is_authorized(req, ps).is_allowed()
+
+    def test_link_slot_count_mismatch(self):
+        """Test that positional linking requires one value per template slot."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_template(
+            PolicyTemplate("principal-template", "permit(principal == ?principal, action, resource);")
+        )
+        with pytest.raises(ValueError, match="1 slot"):
+            ps.link("alice-bob", "principal-template", USER_ALICE, USER_BOB)
+
+        ps.link("alice", "principal-template", USER_ALICE)
+        assert len(ps) == 1
+
+    def test_link_slot_mismatch_leaves_set_usable(self):
+        """Test that a link missing or adding a slot is rejected when it is added."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_template(PolicyTemplate("view-template", VIEW_TEMPLATE))
+        ps.add_template_linked_policy(
+            "alice-view-report",
+            "view-template",
+            {"principal": USER_ALICE, "resource": DOC_REPORT},
+        )
+
+        with pytest.raises(ValueError, match="don't match template"):
+            ps.add_template_linked_policy("bob", "view-template", {"principal": USER_BOB})
+
+        ps.add_template(
+            PolicyTemplate("principal-template", "permit(principal == ?principal, action, resource);")
+        )
+        with pytest.raises(ValueError, match="don't match template"):
+            ps.add_template_linked_policy(
+                "bob",
+                "principal-template",
+                {"principal": USER_BOB, "resource": DOC_REPORT},
+            )
+
+        assert len(ps) == 1
+        req = Request(principal=USER_ALICE, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert is_authorized(req, ps).is_allowed()
+        ps.freeze()
+
+    def test_replace_template_with_other_slots(self):
+        """Test that a template cannot be replaced by one its links don't fit."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        ps.add_template(PolicyTemplate("view-template", VIEW_TEMPLATE))
+        ps.add_template_linked_policy(
+            "alice-view-report",
+            "view-template",
+            {"principal": USER_ALICE, "resource": DOC_REPORT},
+        )
+
+        with pytest.raises(ValueError, match="alice-view-report"):
+            ps.add_template(
+                PolicyTemplate("view-template", "permit(principal == ?principal, action, resource);")
+            )
+
+        # A replacement with the same slots is allowed
+        ps.add_template(
+            PolicyTemplate(
+                "view-template",
+                "permit(principal == ?principal, action, resource in ?resource);",
+            )
+        )
+        req = Request(principal=USER_ALICE, action=ACTION_VIEW, resource=DOC_REPORT)
+        assert is_authorized(req, ps).is_allowed()
+
+    def test_invalid_entity_uid_in_slot(self):
+        """Test error with invalid entity UID in slot."""
+        from cedar_py import PolicySet, PolicyTemplate
+
+        ps = PolicySet()
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
         with pytest.raises(ValueError, match="Invalid entity UID"):
@@ -775,38 +1384,29 @@ class TestTemplateAuthorization:
 
         # Create policy set with template
         ps = PolicySet()
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
         ps.add_template_linked_policy(
             "alice-view-report",
             "view-template",
-            {"principal": 'User::"alice"', "resource": 'Document::"report"'},
+            {"principal": USER_ALICE, "resource": DOC_REPORT},
         )
 
         # Test allowed request
         req_allowed = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
         decision = is_authorized(req_allowed, ps)
         assert decision.is_allowed()
 
         # Test denied request (different principal)
         req_denied = Request(
-            principal='User::"bob"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_BOB,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
         decision = is_authorized(req_denied, ps)
         assert not decision.is_allowed()
@@ -816,56 +1416,54 @@ class TestTemplateAuthorization:
         from cedar_py import PolicySet, PolicyTemplate, Request, is_authorized
 
         ps = PolicySet()
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
 
         # Add multiple linked policies
-        ps.add_template_linked_policy(
-            "alice-view-report",
-            "view-template",
-            {"principal": 'User::"alice"', "resource": 'Document::"report"'},
-        )
-        ps.add_template_linked_policy(
-            "bob-view-data",
-            "view-template",
-            {"principal": 'User::"bob"', "resource": 'Document::"data"'},
+        ps.add_template_linked_policies(
+            [
+                (
+                    "alice-view-report",
+                    "view-template",
+                    {"principal": USER_ALICE, "resource": DOC_REPORT},
+                ),
+                (
+                    "bob-view-data",
+                    "view-template",
+                    {"principal": USER_BOB, "resource": 'Document::"data"'},
+                ),
+            ]
         )
 
         assert len(ps) == 2
 
+        # The set is complete, so freeze it once for the requests below
+        frozen = ps.freeze()
+
         # Alice can view report
         req1 = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
-        assert is_authorized(req1, ps).is_allowed()
+        assert is_authorized(req1, frozen).is_allowed()
 
         # Bob can view data
         req2 = Request(
-            principal='User::"bob"',
-            action='Action::"view"',
+            principal=USER_BOB,
+            action=ACTION_VIEW,
             resource='Document::"data"',
         )
-        assert is_authorized(req2, ps).is_allowed()
+        assert is_authorized(req2, frozen).is_allowed()
 
         # Alice cannot view data
         req3 = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
             resource='Document::"data"',
         )
-        assert not is_authorized(req3, ps).is_allowed()
+        assert not is_authorized(req3, frozen).is_allowed()
 
     def test_mixed_policies_and_templates(self):
         """Test mixing regular policies with template-linked policies."""
@@ -874,50 +1472,28 @@ class TestTemplateAuthorization:
         ps = PolicySet()
 
         # Add a regular policy
-        ps.add_policy(
-            "admin-all",
-            """
-            permit(
-                principal == User::"admin",
-                action,
-                resource
-            );
-        """,
-        )
+        ps.add_policy("admin-all", PERMIT_ADMIN_ALL)
 
         # Add a template and linked policy
-        template = PolicyTemplate(
-            "view-template",
-            """
-            permit(
-                principal == ?principal,
-                action == Action::"view",
-                resource == ?resource
-            );
-        """,
-        )
+        template = PolicyTemplate("view-template", VIEW_TEMPLATE)
 
         ps.add_template(template)
-        ps.add_template_linked_policy(
-            "alice-view-report",
-            "view-template",
-            {"principal": 'User::"alice"', "resource": 'Document::"report"'},
-        )
+        ps.link("alice-view-report", "view-template", USER_ALICE, DOC_REPORT)
 
         assert len(ps) == 2
 
         # Admin can do anything
         req_admin = Request(
             principal='User::"admin"',
-            action='Action::"delete"',
+            action=ACTION_DELETE,
             resource='Document::"anything"',
         )
         assert is_authorized(req_admin, ps).is_allowed()
 
         # Alice can view report (via template)
         req_alice = Request(
-            principal='User::"alice"',
-            action='Action::"view"',
-            resource='Document::"report"',
+            principal=USER_ALICE,
+            action=ACTION_VIEW,
+            resource=DOC_REPORT,
         )
         assert is_authorized(req_alice, ps).is_allowed()